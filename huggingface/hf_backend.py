@@ -11,19 +11,43 @@ Usage:
     python hf_backend.py <repo_id> [model_name] [quant]
 """
 
+import hashlib
 import json
 import logging
 import os
+import re
 import shutil
 import subprocess
 import sys
 import tempfile
+import threading
+import time
 import urllib.error
 import urllib.request
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from huggingface_hub import hf_hub_download, snapshot_download
+except ImportError:
+    # Fall back to the huggingface-cli / wget / urllib download paths
+    hf_hub_download = None
+    snapshot_download = None
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    # Stdlib parser; accepts bytes as well
+    _loads = json.loads
+
 # =============================================================================
 # Configuration
 # =============================================================================
@@ -42,6 +66,52 @@ OLLAMA_CONTAINER = os.environ.get("OLLAMA_CONTAINER", "ollama")
 # Ollama API host
 OLLAMA_HOST = os.environ.get("OLLAMA_HOST", "http://127.0.0.1:11435")
 
+# Keep-alive connection pool size for HuggingFace API sessions
+HTTP_POOL_SIZE = 16
+
+# HTTP status codes that are retried with exponential backoff
+HTTP_RETRY_STATUSES = [429, 500, 502, 503, 504]
+HTTP_RETRY_TOTAL = 5
+
+# Default (connect, read) timeouts in seconds for HuggingFace API calls
+HTTP_TIMEOUT = (5, 30)
+
+# Upper bound in seconds for a single model or GGUF download
+HF_DOWNLOAD_TIMEOUT = int(os.environ.get("HF_DOWNLOAD_TIMEOUT", "7200"))
+
+# On-disk cache for HuggingFace API responses
+HF_API_CACHE_DIR = HF_CACHE_DIR / ".apicache"
+
+# Cache TTLs in seconds: repository file listings change more often than configs
+HF_CACHE_TTL_FILES = int(os.environ.get("HF_CACHE_TTL_FILES", "10"))
+HF_CACHE_TTL_CONFIG = int(os.environ.get("HF_CACHE_TTL_CONFIG", "3600"))
+
+# Misses (404) are cached more briefly, since new GGUF repos appear over time
+HF_CACHE_TTL_NEGATIVE = int(os.environ.get("HF_CACHE_TTL_NEGATIVE", "900"))
+
+# Read size for streaming downloads through urllib
+DOWNLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Lines of subprocess output kept for error messages
+SUBPROCESS_TAIL_LINES = 200
+
+# Environment for huggingface-cli downloads: its progress bars (tqdm) write
+# an update at most every 30 s, so progress can be logged at INFO
+HF_CLI_ENV = dict(os.environ, TQDM_MININTERVAL="30")
+
+# External download tools, resolved once at import
+_HF_CLI = shutil.which("huggingface-cli")
+_WGET = shutil.which("wget")
+
+# Files needed to convert a model to GGUF
+CONVERSION_PATTERNS = ["*.safetensors", "*.json", "tokenizer*"]
+
+# Parallel file transfers for multi-file (e.g., sharded safetensors) downloads
+HF_MAX_WORKERS = int(os.environ.get("HF_MAX_WORKERS", "8"))
+
+# Parallel HTTP Range connections for direct GGUF downloads
+DOWNLOAD_PARTS = int(os.environ.get("HF_DOWNLOAD_PARTS", "8"))
+
 # Supported architectures for conversion to GGUF
 SUPPORTED_ARCHITECTURES = [
     "LlamaForCausalLM",
@@ -58,6 +128,7 @@ SUPPORTED_ARCHITECTURES = [
     "StableLmForCausalLM",
     "OlmoForCausalLM",
 ]
+_SUPPORTED_ARCHES = frozenset(SUPPORTED_ARCHITECTURES)
 
 # Known GGUF providers (checked in order)
 GGUF_PROVIDERS = [
@@ -66,6 +137,10 @@ GGUF_PROVIDERS = [
     "QuantFactory",
     "mradermacher",
 ]
+_GGUF_PROVIDER_SET = frozenset(GGUF_PROVIDERS)
+
+# Maximum concurrent repository probes when searching GGUF providers
+GGUF_SEARCH_WORKERS = 8
 
 # Quantization type preferences (from highest to lowest quality)
 QUANT_PREFERENCES = [
@@ -81,6 +156,13 @@ QUANT_PREFERENCES = [
     "Q2_K",
 ]
 
+# Preference rank per quantization type, and a single pattern matching any of them
+_QUANT_RANK = {q: i for i, q in enumerate(QUANT_PREFERENCES)}
+_QUANT_RE = re.compile("|".join(map(re.escape, QUANT_PREFERENCES)), re.IGNORECASE)
+
+# Runs of anything other than [a-z0-9] become a single hyphen in model names
+_MODEL_NAME_SEP_RE = re.compile(r"[^a-z0-9]+")
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -141,20 +223,276 @@ class ProcessResult:
         }
 
 
+# =============================================================================
+# HTTP Session Management
+# =============================================================================
+
+# Each thread gets its own keep-alive session so TLS handshakes are amortized
+# across calls without sharing a requests.Session between threads.
+_session_local = threading.local()
+_http_backend_config: Dict[str, Any] = {"proxies": None, "verify": True}
+_http_backend_generation = 0
+
+
+def configure_http_backend(
+    proxies: Optional[Dict[str, str]] = None, verify: Any = True
+) -> None:
+    """
+    Configure the HTTP sessions used for HuggingFace API calls.
+
+    Sessions already created by other threads are rebuilt on their next use.
+
+    Args:
+        proxies: Optional proxy mapping passed to requests (e.g., {"https": "..."})
+        verify: TLS verification flag or path to a CA bundle
+    """
+    global _http_backend_generation
+
+    _http_backend_config["proxies"] = proxies
+    _http_backend_config["verify"] = verify
+    _http_backend_generation += 1
+
+
+def _build_session() -> requests.Session:
+    """Create a requests session with connection pooling and retries."""
+    session = requests.Session()
+
+    retry = Retry(
+        total=HTTP_RETRY_TOTAL,
+        backoff_factor=0.5,
+        status_forcelist=HTTP_RETRY_STATUSES,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_SIZE,
+        pool_maxsize=HTTP_POOL_SIZE,
+        max_retries=retry,
+    )
+    session.mount("https://", adapter)
+
+    if _http_backend_config["proxies"]:
+        session.proxies.update(_http_backend_config["proxies"])
+    session.verify = _http_backend_config["verify"]
+
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the calling thread's keep-alive session, creating it on first use."""
+    session = getattr(_session_local, "session", None)
+
+    if session is None or _session_local.generation != _http_backend_generation:
+        if session is not None:
+            session.close()
+        session = _build_session()
+        _session_local.session = session
+        _session_local.generation = _http_backend_generation
+
+    return session
+
+
+# =============================================================================
+# API Response Cache
+# =============================================================================
+
+
+class ResponseCache:
+    """
+    On-disk TTL cache for HuggingFace API responses.
+
+    Each entry is a small JSON file holding the response body along with
+    its timestamp and expiry. Expired entries are kept so they can be served
+    when HuggingFace is unreachable. Cache I/O failures are never fatal.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    @staticmethod
+    def make_key(url: str, token: Optional[str] = None, method: str = "GET") -> str:
+        """Build a cache key from the request method, URL and auth presence."""
+        raw = f"{method}:{url}:{bool(token)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cache entry.
+
+        Args:
+            key: Cache key from make_key()
+            allow_stale: Return the entry even if its TTL has expired
+
+        Returns:
+            Entry dict with timestamp, stale_at, status and body, or None
+        """
+        try:
+            with open(self._path(key), "rb") as f:
+                entry = _loads(f.read())
+        except (OSError, ValueError):
+            entry = None
+
+        if entry is not None and not allow_stale and time.time() >= entry.get("stale_at", 0):
+            entry = None
+
+        if not allow_stale:
+            with self._stats_lock:
+                if entry is None:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+
+        return entry
+
+    def set(self, key: str, body: Any, ttl: int, status: int = 200) -> None:
+        """Store a response body under key for ttl seconds."""
+        now = time.time()
+        entry = {"timestamp": now, "stale_at": now + ttl, "status": status, "body": body}
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=str(self.directory), suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.debug(f"Could not write API cache entry: {e}")
+
+
+_api_cache = ResponseCache(HF_API_CACHE_DIR)
+
+
+def _stale_or_error(
+    cache_key: str, error: str
+) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Serve a stale cached response when HuggingFace is unreachable."""
+    entry = _api_cache.get(cache_key, allow_stale=True)
+
+    if entry is not None and entry.get("status") == 200:
+        logger.warning(f"{error} - serving stale cached response")
+        return entry["body"], None
+
+    return None, error
+
+
+# =============================================================================
+# Filesystem Helpers
+# =============================================================================
+
+# Directories already created by this process
+_MKDIR_DONE: set = set()
+
+
+def _ensure_dir(path: Path) -> None:
+    """Create path (and parents) once per process; later calls are free."""
+    if path not in _MKDIR_DONE:
+        path.mkdir(parents=True, exist_ok=True)
+        _MKDIR_DONE.add(path)
+
+
+def _forget_dir(path: Path) -> None:
+    """Drop path and everything below it from the mkdir memo after removal."""
+    _MKDIR_DONE.difference_update(
+        [p for p in _MKDIR_DONE if p == path or path in p.parents]
+    )
+
+
+# =============================================================================
+# Subprocess Helpers
+# =============================================================================
+
+
+def run_streaming(
+    cmd: List[str],
+    timeout: int,
+    cwd: Optional[str] = None,
+    log_level: int = logging.INFO,
+    env: Optional[Dict[str, str]] = None,
+) -> Tuple[int, str]:
+    """
+    Run a command, streaming its combined stdout/stderr to the logger.
+
+    Output is logged line by line as it arrives instead of being buffered
+    until exit; only the last SUBPROCESS_TAIL_LINES lines are retained.
+
+    Args:
+        cmd: Command and arguments
+        timeout: Seconds before the process is killed
+        cwd: Optional working directory
+        log_level: Level used when logging each output line
+        env: Optional environment for the process
+
+    Returns:
+        Tuple of (return_code, output_tail)
+
+    Raises:
+        subprocess.TimeoutExpired: If the process ran longer than timeout
+    """
+    tail: deque = deque(maxlen=SUBPROCESS_TAIL_LINES)
+    timed_out = threading.Event()
+
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+        cwd=cwd,
+        env=env,
+    )
+
+    def kill() -> None:
+        timed_out.set()
+        proc.kill()
+
+    timer = threading.Timer(timeout, kill)
+    timer.start()
+
+    try:
+        for line in proc.stdout:
+            line = line.rstrip()
+            if line:
+                tail.append(line)
+                logger.log(log_level, line)
+        proc.wait()
+    finally:
+        timer.cancel()
+        proc.stdout.close()
+
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(cmd, timeout)
+
+    return proc.returncode, "\n".join(tail)
+
+
 # =============================================================================
 # HuggingFace API Functions
 # =============================================================================
 
 
 def hf_api_request(
-    endpoint: str, token: Optional[str] = None
+    endpoint: str,
+    token: Optional[str] = None,
+    cache_ttl: Optional[int] = None,
+    timeout: Tuple[float, float] = HTTP_TIMEOUT,
 ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
     """
     Make a request to the HuggingFace API.
 
+    Transient failures (429/5xx) are retried with exponential backoff,
+    honouring any Retry-After header.
+
     Args:
         endpoint: API endpoint (relative to HF_API_BASE)
         token: Optional HuggingFace API token
+        cache_ttl: Seconds to cache a successful response (None disables caching)
+        timeout: (connect, read) timeouts in seconds
 
     Returns:
         Tuple of (response_data, error_message)
@@ -165,41 +503,61 @@ def hf_api_request(
     if token:
         headers["Authorization"] = f"Bearer {token}"
 
-    request = urllib.request.Request(url, headers=headers)
+    cache_key = ResponseCache.make_key(url, token)
+    if cache_ttl:
+        entry = _api_cache.get(cache_key)
+        if entry is not None:
+            if entry.get("status") == 404:
+                return None, f"Repository not found: {endpoint}"
+            return entry["body"], None
 
     try:
-        with urllib.request.urlopen(request, timeout=30) as response:
-            data = json.loads(response.read().decode("utf-8"))
-            return data, None
-    except urllib.error.HTTPError as e:
-        if e.code == 404:
+        response = get_session().get(url, headers=headers, timeout=timeout)
+
+        if response.status_code == 404:
+            if cache_ttl:
+                _api_cache.set(cache_key, None, HF_CACHE_TTL_NEGATIVE, status=404)
             return None, f"Repository not found: {endpoint}"
-        elif e.code == 401:
+        elif response.status_code == 401:
             return None, "Authentication required. Please provide a valid HF token."
-        elif e.code == 403:
+        elif response.status_code == 403:
             return None, "Access denied. This may be a gated model requiring authentication."
-        else:
-            return None, f"HTTP error {e.code}: {e.reason}"
-    except urllib.error.URLError as e:
-        return None, f"Network error: {e.reason}"
-    except json.JSONDecodeError as e:
+        elif response.status_code >= 500:
+            return _stale_or_error(cache_key, f"HTTP error {response.status_code}: {response.reason}")
+        elif response.status_code >= 400:
+            return None, f"HTTP error {response.status_code}: {response.reason}"
+
+        data = _loads(response.content)
+        if cache_ttl:
+            _api_cache.set(cache_key, data, cache_ttl)
+        return data, None
+    except requests.exceptions.RequestException as e:
+        return _stale_or_error(cache_key, f"Network error: {e}")
+    except ValueError as e:
         return None, f"Failed to parse API response: {e}"
     except Exception as e:
         return None, f"Unexpected error: {e}"
 
 
-def get_repo_files(repo_id: str, token: Optional[str] = None) -> Tuple[List[str], Optional[str]]:
+def get_repo_files(
+    repo_id: str,
+    token: Optional[str] = None,
+    timeout: Tuple[float, float] = HTTP_TIMEOUT,
+) -> Tuple[List[str], Optional[str]]:
     """
     Get list of files in a HuggingFace repository.
 
     Args:
         repo_id: HuggingFace repository ID (e.g., "meta-llama/Llama-2-7b")
         token: Optional HuggingFace API token
+        timeout: (connect, read) timeouts in seconds
 
     Returns:
         Tuple of (file_list, error_message)
     """
-    data, error = hf_api_request(f"models/{repo_id}", token)
+    data, error = hf_api_request(
+        f"models/{repo_id}", token, cache_ttl=HF_CACHE_TTL_FILES, timeout=timeout
+    )
 
     if error:
         return [], error
@@ -207,15 +565,61 @@ def get_repo_files(repo_id: str, token: Optional[str] = None) -> Tuple[List[str]
     if not data:
         return [], "Empty response from API"
 
-    # Extract file names from siblings
-    siblings = data.get("siblings", [])
-    files = [s.get("rfilename", "") for s in siblings if s.get("rfilename")]
+    # Extract file names from siblings in a single pass
+    files = [name for name in (s.get("rfilename") for s in data.get("siblings", [])) if name]
 
     return files, None
 
 
+def hf_repo_exists(
+    repo_id: str,
+    token: Optional[str] = None,
+    timeout: Tuple[float, float] = HTTP_TIMEOUT,
+) -> bool:
+    """
+    Check whether a HuggingFace model repository exists.
+
+    Uses a HEAD request so no repository metadata is transferred.
+
+    Args:
+        repo_id: HuggingFace repository ID
+        token: Optional HuggingFace API token
+        timeout: (connect, read) timeouts in seconds
+
+    Returns:
+        True if the repository exists and is accessible
+    """
+    url = f"{HF_API_BASE}/models/{repo_id}"
+    headers = {}
+
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+
+    cache_key = ResponseCache.make_key(url, token, method="HEAD")
+    entry = _api_cache.get(cache_key)
+    if entry is not None:
+        return entry.get("status") == 200
+
+    try:
+        response = get_session().head(url, headers=headers, timeout=timeout, allow_redirects=True)
+    except requests.exceptions.RequestException as e:
+        logger.debug(f"HEAD {url} failed: {e}")
+        return False
+
+    if response.status_code == 200:
+        _api_cache.set(cache_key, None, HF_CACHE_TTL_FILES)
+        return True
+
+    if response.status_code == 404:
+        _api_cache.set(cache_key, None, HF_CACHE_TTL_NEGATIVE, status=404)
+
+    return False
+
+
 def get_model_config(
-    repo_id: str, token: Optional[str] = None
+    repo_id: str,
+    token: Optional[str] = None,
+    timeout: Tuple[float, float] = HTTP_TIMEOUT,
 ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
     """
     Fetch and parse config.json from a HuggingFace repository.
@@ -223,6 +627,7 @@ def get_model_config(
     Args:
         repo_id: HuggingFace repository ID
         token: Optional HuggingFace API token
+        timeout: (connect, read) timeouts in seconds
 
     Returns:
         Tuple of (config_dict, error_message)
@@ -233,16 +638,26 @@ def get_model_config(
     if token:
         headers["Authorization"] = f"Bearer {token}"
 
-    request = urllib.request.Request(url, headers=headers)
+    cache_key = ResponseCache.make_key(url, token)
+    entry = _api_cache.get(cache_key)
+    if entry is not None and entry.get("status") == 200:
+        return entry["body"], None
 
     try:
-        with urllib.request.urlopen(request, timeout=30) as response:
-            config = json.loads(response.read().decode("utf-8"))
-            return config, None
-    except urllib.error.HTTPError as e:
-        if e.code == 404:
+        response = get_session().get(url, headers=headers, timeout=timeout)
+
+        if response.status_code == 404:
             return None, "config.json not found in repository"
-        return None, f"HTTP error {e.code}: {e.reason}"
+        elif response.status_code >= 500:
+            return _stale_or_error(cache_key, f"HTTP error {response.status_code}: {response.reason}")
+        elif response.status_code >= 400:
+            return None, f"HTTP error {response.status_code}: {response.reason}"
+
+        config = _loads(response.content)
+        _api_cache.set(cache_key, config, HF_CACHE_TTL_CONFIG)
+        return config, None
+    except requests.exceptions.RequestException as e:
+        return _stale_or_error(cache_key, f"Failed to fetch config: {e}")
     except Exception as e:
         return None, f"Failed to fetch config: {e}"
 
@@ -252,18 +667,39 @@ def get_model_config(
 # =============================================================================
 
 
-def search_gguf_repo(repo_id: str, token: Optional[str] = None) -> Optional[str]:
+def _filter_gguf(files: List[str]) -> List[str]:
+    """Return only the GGUF files from a repository file list."""
+    return [f for f in files if f.endswith(".gguf")]
+
+
+def _repo_gguf_files(repo_id: str, token: Optional[str] = None) -> List[str]:
+    """Return the GGUF files in a repository (empty if missing or inaccessible)."""
+    logger.debug(f"Checking for GGUF repo: {repo_id}")
+    files, error = get_repo_files(repo_id, token)
+
+    if error:
+        return []
+
+    return _filter_gguf(files)
+
+
+def _find_gguf_repo(
+    repo_id: str, token: Optional[str] = None
+) -> Tuple[Optional[str], List[str]]:
     """
-    Search for an existing GGUF repository for a given model.
+    Find a provider GGUF repository for a model, along with its GGUF files.
 
-    Checks common GGUF providers like TheBloke, bartowski, etc.
+    Candidates are probed concurrently with cheap HEAD requests, but the
+    result always honours provider order: a hit is only returned once every
+    higher-priority candidate has missed. Only existing candidates get a
+    full file listing to confirm they contain GGUF files.
 
     Args:
         repo_id: Original HuggingFace repository ID
         token: Optional HuggingFace API token
 
     Returns:
-        GGUF repository ID if found, None otherwise
+        Tuple of (gguf_repo_id, gguf_files); (None, []) if nothing was found
     """
     # Extract model name from repo_id
     model_name = repo_id.split("/")[-1]
@@ -275,27 +711,73 @@ def search_gguf_repo(repo_id: str, token: Optional[str] = None) -> Optional[str]
         model_name.replace("_", "-"),
     ]
 
+    # Build the full candidate list in priority order. HuggingFace repo IDs
+    # resolve case-insensitively, so variants differing only in case collapse.
+    candidates = []
+    seen = set()
     for provider in GGUF_PROVIDERS:
         for name in name_variations:
             # Try different naming conventions
-            candidates = [
+            for candidate in (
                 f"{provider}/{name}-GGUF",
                 f"{provider}/{name}-gguf",
                 f"{provider}/{name.lower()}-GGUF",
-            ]
+            ):
+                if candidate.lower() not in seen:
+                    seen.add(candidate.lower())
+                    candidates.append(candidate)
+
+    results: Dict[int, bool] = {}
+    winner = None
+    winner_files: List[str] = []
+
+    with ThreadPoolExecutor(max_workers=GGUF_SEARCH_WORKERS) as executor:
+        futures = {
+            executor.submit(hf_repo_exists, candidate, token): index
+            for index, candidate in enumerate(candidates)
+        }
+
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+
+            # Pick the first hit whose higher-priority candidates all missed
+            for index in range(len(candidates)):
+                if index not in results:
+                    break
+                if results[index]:
+                    winner_files = _repo_gguf_files(candidates[index], token)
+                    if winner_files:
+                        winner = candidates[index]
+                        break
+                    results[index] = False
+
+            if winner:
+                executor.shutdown(wait=False, cancel_futures=True)
+                break
+
+    logger.debug(f"API cache: {_api_cache.hits} hit(s), {_api_cache.misses} miss(es)")
+
+    if winner:
+        logger.info(f"Found GGUF repository: {winner}")
 
-            for candidate in candidates:
-                logger.debug(f"Checking for GGUF repo: {candidate}")
-                files, error = get_repo_files(candidate, token)
+    return winner, winner_files
 
-                if not error and files:
-                    # Verify it actually has GGUF files
-                    gguf_files = [f for f in files if f.endswith(".gguf")]
-                    if gguf_files:
-                        logger.info(f"Found GGUF repository: {candidate}")
-                        return candidate
 
-    return None
+def search_gguf_repo(repo_id: str, token: Optional[str] = None) -> Optional[str]:
+    """
+    Search for an existing GGUF repository for a given model.
+
+    Checks common GGUF providers like TheBloke, bartowski, etc.
+
+    Args:
+        repo_id: Original HuggingFace repository ID
+        token: Optional HuggingFace API token
+
+    Returns:
+        GGUF repository ID if found, None otherwise
+    """
+    gguf_repo, _ = _find_gguf_repo(repo_id, token)
+    return gguf_repo
 
 
 def check_model(repo_id: str, token: Optional[str] = None) -> ModelInfo:
@@ -325,7 +807,7 @@ def check_model(repo_id: str, token: Optional[str] = None) -> ModelInfo:
         return info
 
     # Check for existing GGUF files
-    gguf_files = [f for f in files if f.endswith(".gguf")]
+    gguf_files = _filter_gguf(files)
 
     if gguf_files:
         info.has_gguf = True
@@ -334,6 +816,12 @@ def check_model(repo_id: str, token: Optional[str] = None) -> ModelInfo:
         logger.info(f"Model has {len(gguf_files)} GGUF file(s)")
         return info
 
+    # GGUF provider repos hold no convertible weights and won't have a
+    # GGUF copy elsewhere - skip the config fetch and provider search
+    if repo_id.split("/")[0] in _GGUF_PROVIDER_SET or repo_id.lower().endswith(("-gguf", "_gguf")):
+        logger.warning(f"GGUF repository {repo_id} contains no GGUF files")
+        return info
+
     # No GGUF files - check if model is convertible
     config, config_error = get_model_config(repo_id, token)
 
@@ -344,7 +832,7 @@ def check_model(repo_id: str, token: Optional[str] = None) -> ModelInfo:
         architectures = config.get("architectures", [])
         if architectures:
             info.architecture = architectures[0]
-            info.is_convertible = info.architecture in SUPPORTED_ARCHITECTURES
+            info.is_convertible = info.architecture in _SUPPORTED_ARCHES
 
             if info.is_convertible:
                 logger.info(f"Model architecture '{info.architecture}' is supported for conversion")
@@ -353,13 +841,12 @@ def check_model(repo_id: str, token: Optional[str] = None) -> ModelInfo:
 
     # Search for existing GGUF repositories
     logger.info("Searching for existing GGUF repositories...")
-    gguf_repo = search_gguf_repo(repo_id, token)
+    gguf_repo, gguf_files = _find_gguf_repo(repo_id, token)
 
     if gguf_repo:
         info.gguf_repo = gguf_repo
-        # Get the GGUF files from that repo
-        gguf_files, _ = get_repo_files(gguf_repo, token)
-        info.gguf_files = [f for f in gguf_files if f.endswith(".gguf")]
+        # Reuse the GGUF file list gathered while confirming the match
+        info.gguf_files = gguf_files
         info.has_gguf = True
         logger.info(f"Found GGUF repo: {gguf_repo} with {len(info.gguf_files)} file(s)")
 
@@ -440,7 +927,7 @@ def download_only_model(
     else:
         output_dir = Path(output_dir)
     
-    output_dir.mkdir(parents=True, exist_ok=True)
+    _ensure_dir(output_dir)
     
     result = {
         "status": "pending",
@@ -452,8 +939,29 @@ def download_only_model(
     
     logger.info(f"Downloading model {repo_id} to {output_dir}")
     
+    # Download in-process with huggingface_hub when available
+    if snapshot_download is not None:
+        try:
+            snapshot_download(
+                repo_id=repo_id,
+                local_dir=str(output_dir),
+                allow_patterns=include_patterns,
+                max_workers=HF_MAX_WORKERS,
+                token=token,
+            )
+            
+            # List downloaded files
+            result["files"] = [str(f.relative_to(output_dir)) for f in output_dir.rglob("*") if f.is_file()]
+            result["status"] = "completed"
+            logger.info(f"Downloaded {len(result['files'])} files to {output_dir}")
+            return result
+        except Exception as e:
+            logger.warning(f"snapshot_download failed: {e}")
+            result["status"] = "failed"
+            result["error"] = f"Download failed: {e}"
+    
     # Use huggingface-cli for download
-    if shutil.which("huggingface-cli"):
+    if _HF_CLI:
         cmd = [
             "huggingface-cli", "download", repo_id,
             "--local-dir", str(output_dir),
@@ -468,20 +976,21 @@ def download_only_model(
             cmd.extend(["--token", token])
         
         try:
-            subprocess.run(cmd, check=True, capture_output=True, text=True, timeout=7200)
+            returncode, output = run_streaming(cmd, timeout=HF_DOWNLOAD_TIMEOUT, env=HF_CLI_ENV)
             
-            # List downloaded files
-            result["files"] = [str(f.relative_to(output_dir)) for f in output_dir.rglob("*") if f.is_file()]
-            result["status"] = "completed"
-            logger.info(f"Downloaded {len(result['files'])} files to {output_dir}")
+            if returncode == 0:
+                # List downloaded files
+                result["files"] = [str(f.relative_to(output_dir)) for f in output_dir.rglob("*") if f.is_file()]
+                result["status"] = "completed"
+                logger.info(f"Downloaded {len(result['files'])} files to {output_dir}")
+            else:
+                result["status"] = "failed"
+                result["error"] = f"Download failed: {output}"
             
-        except subprocess.CalledProcessError as e:
-            result["status"] = "failed"
-            result["error"] = f"Download failed: {e.stderr}"
         except subprocess.TimeoutExpired:
             result["status"] = "failed"
             result["error"] = "Download timed out"
-    else:
+    elif result["status"] != "failed":
         result["status"] = "failed"
         result["error"] = "huggingface-cli not available"
     
@@ -510,29 +1019,142 @@ def select_gguf_file(gguf_files: List[str], quant: str = DEFAULT_QUANT) -> Optio
     # Normalize quant type for matching
     quant_upper = quant.upper().replace("-", "_")
 
-    # First, try exact match
+    best_rank = len(QUANT_PREFERENCES)
+    best_file = None
+
     for f in gguf_files:
-        f_upper = f.upper()
-        if quant_upper in f_upper:
+        # Exact match wins immediately
+        if quant_upper in f.upper():
             logger.info(f"Selected GGUF file (exact match): {f}")
             return f
 
-    # Try to find closest quantization in preference order
-    quant_index = QUANT_PREFERENCES.index(quant_upper) if quant_upper in QUANT_PREFERENCES else -1
+        # Otherwise remember the highest-quality known quantization seen so far
+        for match in _QUANT_RE.finditer(f):
+            rank = _QUANT_RANK[match.group(0).upper()]
+            if rank < best_rank:
+                best_rank = rank
+                best_file = f
 
-    if quant_index >= 0:
-        # Search for alternatives in preference order (prefer higher quality)
-        for alt_quant in QUANT_PREFERENCES:
-            for f in gguf_files:
-                if alt_quant in f.upper():
-                    logger.info(f"Selected GGUF file (alternative {alt_quant}): {f}")
-                    return f
+    # Fall back to the closest quantization in preference order (prefer higher quality)
+    if quant_upper in _QUANT_RANK and best_file:
+        logger.info(f"Selected GGUF file (alternative {QUANT_PREFERENCES[best_rank]}): {best_file}")
+        return best_file
 
     # Fall back to first file
     logger.info(f"Selected GGUF file (fallback): {gguf_files[0]}")
     return gguf_files[0]
 
 
+def _drop_page_cache(f, offset: int, length: int) -> None:
+    """Advise the kernel that a written file range will not be re-read (best effort)."""
+    if not hasattr(os, "posix_fadvise"):
+        return
+
+    try:
+        f.flush()
+        os.posix_fadvise(f.fileno(), offset, length, os.POSIX_FADV_DONTNEED)
+    except OSError:
+        pass
+
+
+class _RangeNotSupported(Exception):
+    """Raised when the server ignores a Range request."""
+
+
+def _download_ranges(url: str, output_path: Path, headers: Dict[str, str]) -> bool:
+    """
+    Download a file using parallel HTTP Range requests.
+
+    The file is split into DOWNLOAD_PARTS byte ranges, each fetched on its own
+    connection and written at its offset in a pre-sized output file.
+
+    Args:
+        url: File URL
+        output_path: Destination path
+        headers: Request headers (e.g., Authorization)
+
+    Returns:
+        True if the file was downloaded, False if the server does not
+        support range requests and a single-connection download is needed
+    """
+    head = get_session().head(url, headers=headers, allow_redirects=True, timeout=HTTP_TIMEOUT)
+    total = int(head.headers.get("Content-Length", 0))
+
+    if head.status_code != 200 or total <= 0 or head.headers.get("Accept-Ranges") != "bytes":
+        return False
+
+    # Only send credentials to the original host, not to a redirected CDN URL
+    final_url = head.url
+    part_headers = headers if final_url == url else {}
+
+    part_size = -(-total // DOWNLOAD_PARTS)
+    ranges = [(start, min(start + part_size, total) - 1) for start in range(0, total, part_size)]
+
+    # Reserve the whole file up front so the out-of-order part writes land in
+    # a few contiguous extents instead of being allocated piecemeal
+    with open(output_path, "wb") as f:
+        try:
+            os.posix_fallocate(f.fileno(), 0, total)
+        except (AttributeError, OSError):
+            # Not available on this platform/filesystem; a sparse resize will do
+            f.truncate(total)
+
+    progress_lock = threading.Lock()
+    completed = [0]
+    # Set when a part fails, so the others stop instead of finishing
+    # ranges of a file that is about to be thrown away
+    failed = threading.Event()
+
+    def fetch_range(byte_range: Tuple[int, int]) -> None:
+        start, end = byte_range
+        range_headers = dict(part_headers, Range=f"bytes={start}-{end}")
+
+        with get_session().get(final_url, headers=range_headers, stream=True, timeout=(5, 300)) as response:
+            if response.status_code != 206:
+                raise _RangeNotSupported(f"HTTP {response.status_code}")
+            response.raise_for_status()
+
+            # Parts write to disjoint offsets, so each uses its own file handle
+            with open(output_path, "r+b") as f:
+                f.seek(start)
+                offset = start
+                for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                    if failed.is_set():
+                        return
+                    f.write(chunk)
+                    _drop_page_cache(f, offset, len(chunk))
+                    offset += len(chunk)
+
+        if offset != end + 1:
+            raise IOError(f"Incomplete range {start}-{end}: got {offset - start} bytes")
+
+        with progress_lock:
+            completed[0] += 1
+            logger.info(f"Downloaded part {completed[0]}/{len(ranges)}")
+
+    logger.info(f"Downloading {total} bytes in {len(ranges)} parallel parts")
+
+    executor = ThreadPoolExecutor(max_workers=len(ranges))
+    try:
+        for future in as_completed([executor.submit(fetch_range, r) for r in ranges]):
+            future.result()
+    except BaseException as e:
+        # Stop the remaining parts at their next chunk and drop the partial
+        # file (and its reserved space) before any fallback download
+        failed.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+        try:
+            os.remove(output_path)
+        except OSError:
+            pass
+        if isinstance(e, _RangeNotSupported):
+            return False
+        raise
+
+    executor.shutdown()
+    return True
+
+
 def download_gguf(
     repo_id: str,
     filename: str,
@@ -554,7 +1176,7 @@ def download_gguf(
         Tuple of (output_path, error_message)
     """
     output_dir = Path(output_dir)
-    output_dir.mkdir(parents=True, exist_ok=True)
+    _ensure_dir(output_dir)
     output_path = output_dir / filename
 
     url = f"https://huggingface.co/{repo_id}/resolve/main/{filename}"
@@ -562,8 +1184,21 @@ def download_gguf(
     logger.info(f"Downloading: {url}")
     logger.info(f"Destination: {output_path}")
 
-    # Try using huggingface-cli first (better for large files)
-    if shutil.which("huggingface-cli"):
+    # Download in-process with huggingface_hub when available (resumes by default)
+    if hf_hub_download is not None:
+        try:
+            path = hf_hub_download(
+                repo_id=repo_id,
+                filename=filename,
+                local_dir=str(output_dir),
+                token=token,
+            )
+            return str(path), None
+        except Exception as e:
+            logger.warning(f"hf_hub_download failed: {e}")
+
+    # Try using huggingface-cli next (better for large files)
+    if _HF_CLI:
         cmd = [
             "huggingface-cli",
             "download",
@@ -579,11 +1214,9 @@ def download_gguf(
             cmd.extend(["--token", token])
 
         try:
-            result = subprocess.run(
-                cmd, capture_output=True, text=True, timeout=3600  # 1 hour timeout
-            )
+            returncode, output = run_streaming(cmd, timeout=HF_DOWNLOAD_TIMEOUT, env=HF_CLI_ENV)
 
-            if result.returncode == 0:
+            if returncode == 0:
                 # huggingface-cli may place file in subdirectory
                 if output_path.exists():
                     return str(output_path), None
@@ -593,43 +1226,59 @@ def download_gguf(
 
                 return None, "Download completed but file not found"
             else:
-                logger.warning(f"huggingface-cli failed: {result.stderr}")
+                logger.warning(f"huggingface-cli failed: {output}")
         except subprocess.TimeoutExpired:
             return None, "Download timed out"
         except Exception as e:
             logger.warning(f"huggingface-cli error: {e}")
 
     # Fall back to wget with resume support
-    if shutil.which("wget"):
-        cmd = ["wget", "-c", "-O", str(output_path), url]
+    if _WGET:
+        # One progress line per 32 MiB instead of one per 50 KiB
+        cmd = ["wget", "-c", "--progress=dot:giga", "-O", str(output_path), url]
 
         if token:
             cmd.insert(1, f"--header=Authorization: Bearer {token}")
 
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=3600)
+            returncode, output = run_streaming(cmd, timeout=HF_DOWNLOAD_TIMEOUT)
 
-            if result.returncode == 0 and output_path.exists():
+            if returncode == 0 and output_path.exists():
                 return str(output_path), None
             else:
-                return None, f"wget failed: {result.stderr}"
+                return None, f"wget failed: {output}"
         except subprocess.TimeoutExpired:
             return None, "Download timed out"
         except Exception as e:
             return None, f"wget error: {e}"
 
-    # Fall back to urllib (no resume support)
-    logger.warning("Using urllib (no resume support)")
     headers = {}
     if token:
         headers["Authorization"] = f"Bearer {token}"
 
+    # Fall back to direct download over parallel range requests
+    try:
+        if _download_ranges(url, output_path, headers):
+            return str(output_path), None
+    except Exception as e:
+        logger.warning(f"Parallel download failed: {e}")
+
+    # Fall back to urllib (no resume support)
+    logger.warning("Using urllib (no resume support)")
     request = urllib.request.Request(url, headers=headers)
 
     try:
         with urllib.request.urlopen(request, timeout=3600) as response:
             with open(output_path, "wb") as f:
-                shutil.copyfileobj(response, f)
+                offset = 0
+                while True:
+                    chunk = response.read(DOWNLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    # Keep multi-GB downloads from evicting the rest of the page cache
+                    _drop_page_cache(f, offset, len(chunk))
+                    offset += len(chunk)
         return str(output_path), None
     except Exception as e:
         return None, f"Download failed: {e}"
@@ -653,13 +1302,33 @@ def download_model_for_conversion(
     """
     output_dir = Path(output_dir)
     model_dir = output_dir / repo_id.replace("/", "_")
-    model_dir.mkdir(parents=True, exist_ok=True)
+    _ensure_dir(model_dir)
 
     logger.info(f"Downloading model for conversion: {repo_id}")
     logger.info(f"Destination: {model_dir}")
 
+    # Download in-process with huggingface_hub when available
+    if snapshot_download is not None:
+        try:
+            snapshot_download(
+                repo_id=repo_id,
+                local_dir=str(model_dir),
+                allow_patterns=CONVERSION_PATTERNS,
+                max_workers=HF_MAX_WORKERS,
+                token=token,
+            )
+
+            # Verify essential files exist
+            if (model_dir / "config.json").exists():
+                return str(model_dir), None
+            return None, "Download completed but config.json not found"
+        except Exception as e:
+            logger.warning(f"snapshot_download failed: {e}")
+            if not _HF_CLI:
+                return None, f"Download failed: {e}"
+
     # Use huggingface-cli for full model download
-    if shutil.which("huggingface-cli"):
+    if _HF_CLI:
         cmd = [
             "huggingface-cli",
             "download",
@@ -668,21 +1337,20 @@ def download_model_for_conversion(
             str(model_dir),
             "--local-dir-use-symlinks",
             "False",
-            "--include",
-            "*.safetensors",
-            "--include",
-            "*.json",
-            "--include",
-            "tokenizer*",
         ]
 
+        for pattern in CONVERSION_PATTERNS:
+            cmd.extend(["--include", pattern])
+
+        cmd.extend(["--max-workers", str(HF_MAX_WORKERS)])
+
         if token:
             cmd.extend(["--token", token])
 
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=7200)
+            returncode, output = run_streaming(cmd, timeout=HF_DOWNLOAD_TIMEOUT, env=HF_CLI_ENV)
 
-            if result.returncode == 0:
+            if returncode == 0:
                 # Verify essential files exist
                 config_path = model_dir / "config.json"
                 if config_path.exists():
@@ -690,7 +1358,7 @@ def download_model_for_conversion(
                 else:
                     return None, "Download completed but config.json not found"
             else:
-                return None, f"Download failed: {result.stderr}"
+                return None, f"Download failed: {output}"
         except subprocess.TimeoutExpired:
             return None, "Download timed out"
         except Exception as e:
@@ -726,7 +1394,7 @@ def convert_to_gguf(
         return None, f"Conversion script not found: {convert_script}"
 
     output_path = Path(output_path)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    _ensure_dir(output_path.parent)
 
     logger.info(f"Converting model to GGUF: {model_dir}")
     logger.info(f"Output: {output_path}")
@@ -742,19 +1410,13 @@ def convert_to_gguf(
     ]
 
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=3600,
-            cwd=str(LLAMA_CPP_DIR),
-        )
-
-        if result.returncode == 0 and output_path.exists():
+        returncode, output = run_streaming(cmd, timeout=3600, cwd=str(LLAMA_CPP_DIR))
+
+        if returncode == 0 and output_path.exists():
             logger.info(f"Conversion successful: {output_path}")
             return str(output_path), None
         else:
-            error_msg = result.stderr or result.stdout or "Unknown error"
+            error_msg = output or "Unknown error"
             return None, f"Conversion failed: {error_msg}"
     except subprocess.TimeoutExpired:
         return None, "Conversion timed out"
@@ -790,7 +1452,7 @@ def quantize_gguf(
         return None, f"llama-quantize not found in {LLAMA_CPP_DIR}"
 
     output_path = Path(output_path)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    _ensure_dir(output_path.parent)
 
     logger.info(f"Quantizing GGUF: {input_path}")
     logger.info(f"Quantization type: {quant_type}")
@@ -799,13 +1461,13 @@ def quantize_gguf(
     cmd = [str(quantize_bin), input_path, str(output_path), quant_type]
 
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=3600)
+        returncode, output = run_streaming(cmd, timeout=3600)
 
-        if result.returncode == 0 and output_path.exists():
+        if returncode == 0 and output_path.exists():
             logger.info(f"Quantization successful: {output_path}")
             return str(output_path), None
         else:
-            error_msg = result.stderr or result.stdout or "Unknown error"
+            error_msg = output or "Unknown error"
             return None, f"Quantization failed: {error_msg}"
     except subprocess.TimeoutExpired:
         return None, "Quantization timed out"
@@ -842,7 +1504,7 @@ def create_modelfile(
         return None, f"GGUF file not found: {gguf_path}"
 
     modelfile_dir = OLLAMA_MODELS_DIR / "modelfiles"
-    modelfile_dir.mkdir(parents=True, exist_ok=True)
+    _ensure_dir(modelfile_dir)
     modelfile_path = modelfile_dir / f"{model_name}.Modelfile"
 
     lines = [f"FROM {gguf_path}"]
@@ -883,7 +1545,7 @@ def import_to_ollama(modelfile_path: str, model_name: str) -> Tuple[bool, Option
     """
     Import a model into Ollama.
     
-    Uses docker exec to create a temp Modelfile inside the container and run ollama create.
+    Copies the Modelfile into the container with docker cp and runs ollama create.
 
     Args:
         modelfile_path: Path to the Modelfile
@@ -896,51 +1558,51 @@ def import_to_ollama(modelfile_path: str, model_name: str) -> Tuple[bool, Option
     if not modelfile_path.exists():
         return False, f"Modelfile not found: {modelfile_path}"
 
-    # Read the Modelfile content
-    try:
-        with open(modelfile_path, 'r') as f:
-            modelfile_content = f.read()
-    except Exception as e:
-        return False, f"Failed to read Modelfile: {e}"
-
     logger.info(f"Importing model to Ollama: {model_name}")
 
     # Sanitize model name - lowercase, replace underscores with hyphens
     safe_model_name = model_name.lower().replace('_', '-')
     
-    # Escape the modelfile content for shell
-    # Replace single quotes with escaped version for shell
-    escaped_content = modelfile_content.replace("'", "'\\''")
+    container_modelfile = "/tmp/Modelfile"
     
-    # Use docker exec to:
-    # 1. Write Modelfile to temp location inside container
-    # 2. Run ollama create
-    # 3. Clean up temp file
+    # Copy the Modelfile verbatim - no shell quoting of its content needed
+    copy_cmd = [
+        "sudo", "docker", "cp",
+        str(modelfile_path), f"{OLLAMA_CONTAINER}:{container_modelfile}"
+    ]
     cmd = [
         "sudo", "docker", "exec", OLLAMA_CONTAINER,
-        "sh", "-c",
-        f"echo '{escaped_content}' > /tmp/Modelfile && ollama create {safe_model_name} -f /tmp/Modelfile && rm /tmp/Modelfile"
+        "ollama", "create", safe_model_name, "-f", container_modelfile
+    ]
+    cleanup_cmd = [
+        "sudo", "docker", "exec", OLLAMA_CONTAINER,
+        "rm", "-f", container_modelfile
     ]
     
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=600
-        )
+        copy_result = subprocess.run(copy_cmd, capture_output=True, text=True, timeout=60)
+        if copy_result.returncode != 0:
+            error_msg = copy_result.stderr or copy_result.stdout or "Unknown error"
+            return False, f"Failed to copy Modelfile into container: {error_msg}"
         
-        if result.returncode == 0:
+        returncode, output = run_streaming(cmd, timeout=600)
+        
+        if returncode == 0:
             logger.info(f"Successfully imported model: {safe_model_name}")
             return True, None
         else:
-            error_msg = result.stderr or result.stdout or "Unknown error"
+            error_msg = output or "Unknown error"
             return False, f"Import failed: {error_msg}"
             
     except subprocess.TimeoutExpired:
         return False, "Import timed out"
     except Exception as e:
         return False, f"Import error: {e}"
+    finally:
+        try:
+            subprocess.run(cleanup_cmd, capture_output=True, timeout=60)
+        except Exception:
+            pass
 
 
 # =============================================================================
@@ -981,12 +1643,8 @@ def process_huggingface_model(
     # Default model name from repo_id
     if not model_name:
         # Sanitize: lowercase, keep hyphens, remove special chars
-        raw_name = repo_id.split("/")[-1].lower()
-        model_name = ''.join(c if c.isalnum() or c == '-' else '-' for c in raw_name)
-        # Remove consecutive hyphens and strip
-        while '--' in model_name:
-            model_name = model_name.replace('--', '-')
-        model_name = model_name.strip('-')
+        raw_name = repo_id.rsplit("/", 1)[-1].lower()
+        model_name = _MODEL_NAME_SEP_RE.sub("-", raw_name).strip("-")
 
     result.model_name = model_name
 
@@ -1089,7 +1747,7 @@ def process_huggingface_model(
             if quant.upper() != "F16":
                 add_step("quantize", "running")
                 output_dir = HF_CACHE_DIR / "gguf"
-                output_dir.mkdir(parents=True, exist_ok=True)
+                _ensure_dir(output_dir)
                 quant_path = output_dir / f"{model_name}_{quant}.gguf"
 
                 final_path, error = quantize_gguf(gguf_path, str(quant_path), quant)
@@ -1151,6 +1809,7 @@ def process_huggingface_model(
             for temp_dir in temp_dirs:
                 try:
                     shutil.rmtree(temp_dir, ignore_errors=True)
+                    _forget_dir(temp_dir)
                     logger.debug(f"Cleaned up: {temp_dir}")
                 except Exception:
                     pass
@@ -13,19 +13,40 @@ Features:
 - Custom /api/queue endpoint to view queue status
 """
 
+import http.client
 import http.server
 import json
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 import re
+import select
+import signal
+import socket
 import sqlite3
-import socketserver
+import threading
+import time
 import urllib.request
 import urllib.error
-from datetime import datetime, date
-from typing import Optional
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from datetime import datetime, date, timedelta
+from typing import Any, Callable, Iterator, Optional
 from urllib.parse import urlparse
 
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    # Stdlib encoder, without the default padding after separators
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+    # Stdlib parser; accepts bytes as well
+    _loads = json.loads
+
 # Configuration from environment
 OLLAMA_BACKEND = os.environ.get("OLLAMA_BACKEND", "http://127.0.0.1:11435")
 LISTEN_PORT = int(os.environ.get("LISTEN_PORT", "11434"))
@@ -34,24 +55,137 @@ RATE_LIMIT = int(os.environ.get("RATE_LIMIT", "5"))
 DISK_PATH = os.environ.get("DISK_PATH", "/data/ollama")
 DISK_THRESHOLD = int(os.environ.get("DISK_THRESHOLD", "90"))  # percent
 CLEANUP_DAYS = int(os.environ.get("CLEANUP_DAYS", "30"))
+PROXY_WORKERS = int(os.environ.get("PROXY_WORKERS", "1"))
+
+# Rate-limit rows only matter for today; older ones are purged periodically
+RATE_LIMIT_RETENTION_DAYS = 7
+MAINTENANCE_INTERVAL = 3600  # seconds
+
+# Parsed once; proxied requests talk to the backend with http.client
+_BACKEND_URL = urlparse(OLLAMA_BACKEND)
+
+# Chunk size used when streaming request/response bodies
+PROXY_CHUNK_SIZE = 65536
+
+# Largest request body buffered for the intercepted JSON endpoints
+MAX_JSON_BODY = 1024 * 1024
+
+# Stack size for handler threads; the 8 MB default is far more than a
+# handler needs and is reserved for every concurrent connection
+HANDLER_STACK_SIZE = 1024 * 1024
+
+# Connections are handled on a bounded pool of reused threads, started as
+# needed. A streamed generation, model transfer or idle keep-alive
+# connection holds its thread until it ends, so the pool is sized for many
+# open streams. Connections arriving while every thread is busy are
+# answered with SERVER_BUSY_RESPONSE instead of waiting behind the streams.
+HANDLER_POOL_SIZE = max(256, (os.cpu_count() or 1) * 16)
+
+_busy_body = b'{"error":"Server busy","message":"Too many open connections, retry shortly"}'
+SERVER_BUSY_RESPONSE = (
+    b"HTTP/1.1 503 Service Unavailable\r\n"
+    b"Content-Type: application/json\r\n"
+    b"Content-Length: %d\r\n"
+    b"Retry-After: 1\r\n"
+    b"Connection: close\r\n"
+    b"\r\n%s" % (len(_busy_body), _busy_body)
+)
+
+# Idle keep-alive connections to the backend kept for reuse
+BACKEND_POOL_SIZE = 16
+
+# Idle PROXY_CHUNK_SIZE buffers kept for reuse when copying bodies
+BUFFER_POOL_SIZE = 16
+
+# Send buffer for client sockets; lets large streamed responses (model
+# blobs) be handed to the kernel in fewer, bigger writes
+CLIENT_SNDBUF_SIZE = 256 * 1024
+
+# Clients may keep connections open between requests (HTTP/1.1). An idle
+# connection holds a handler thread, so it is closed after
+# CLIENT_IDLE_TIMEOUT seconds; once a request has started, client reads and
+# writes may take up to CLIENT_TIMEOUT seconds.
+CLIENT_IDLE_TIMEOUT = 5
+CLIENT_TIMEOUT = 300
+
+# Headers that only apply to a single connection and are not forwarded
+HOP_BY_HOP_HEADERS = frozenset({
+    "connection", "keep-alive", "proxy-connection", "te", "trailer",
+    "transfer-encoding", "upgrade",
+})
+
+# Request headers not copied to the backend; Content-Length is set anew
+REQUEST_SKIPPED_HEADERS = HOP_BY_HOP_HEADERS | {"host", "content-length"}
+
+# Idle SQLite connections kept around for reuse by handler threads
+DB_POOL_SIZE = 8
 
-# Logging setup
+# Request-path writes are batched by a single writer thread: up to
+# DB_WRITE_BATCH writes arriving within DB_WRITE_DELAY seconds share a commit
+DB_WRITE_BATCH = 64
+DB_WRITE_DELAY = 0.005
+DB_WRITE_QUEUE_SIZE = 1000
+DB_WRITE_TIMEOUT = 10
+
+# Raised by DatabaseWriter.execute() when a write could not be applied
+DB_WRITE_ERRORS = (TimeoutError, queue.Full, sqlite3.Error)
+
+# Seconds the backend's model list is reused by check_model_exists()
+TAGS_CACHE_TTL = 5.0
+
+# Seconds a merged /api/tags response is served without rechecking
+TAGS_RESPONSE_TTL = 1.0
+
+# Seconds a disk space reading is reused by check_disk_space()
+DISK_CACHE_TTL = 2.0
+
+# Logging setup: records are put on a queue by the calling thread and
+# formatted and written by a listener thread started in main()
+_log_queue = queue.SimpleQueue()
+_log_output = logging.StreamHandler()
+_log_output.setFormatter(logging.Formatter(
+    "[ohhhllama] %(asctime)s %(levelname)s %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S"
+))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_output)
 logging.basicConfig(
     level=logging.INFO,
-    format="[ohhhllama] %(asctime)s %(levelname)s %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S"
+    format="%(message)s",
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
 logger = logging.getLogger(__name__)
 
 
+_disk_cache_lock = threading.Lock()
+_disk_cache = {"ts": 0.0, "result": None}
+
+
 def check_disk_space() -> tuple[bool, dict]:
     """
     Check if disk has enough space.
     
+    The reading is reused for DISK_CACHE_TTL seconds so bursts of pull
+    and health requests don't each call statvfs.
+    
     Returns:
         Tuple of (ok, stats) where ok is True if usage is below threshold.
         stats contains path, used_percent, free_gb, and status.
     """
+    now = time.monotonic()
+    with _disk_cache_lock:
+        result = _disk_cache["result"]
+        if result is not None and now - _disk_cache["ts"] < DISK_CACHE_TTL:
+            return result[0], dict(result[1])
+    
+    ok, stats = read_disk_space()
+    with _disk_cache_lock:
+        _disk_cache.update(ts=now, result=(ok, stats))
+    
+    return ok, dict(stats)
+
+
+def read_disk_space() -> tuple[bool, dict]:
+    """Read disk usage for DISK_PATH with statvfs."""
     try:
         stat = os.statvfs(DISK_PATH)
         total_bytes = stat.f_blocks * stat.f_frsize
@@ -86,6 +220,44 @@ def check_disk_space() -> tuple[bool, dict]:
         }
 
 
+_db_pool: queue.LifoQueue = queue.LifoQueue(maxsize=DB_POOL_SIZE)
+
+
+def _connect_db() -> sqlite3.Connection:
+    """Open a database connection with per-connection tuning applied."""
+    conn = sqlite3.connect(DB_PATH, isolation_level=None, check_same_thread=False)
+    # NORMAL only syncs at WAL checkpoints, which is safe in WAL mode
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-8000")
+    conn.execute("PRAGMA mmap_size=134217728")
+    return conn
+
+
+@contextmanager
+def get_conn() -> Iterator[sqlite3.Connection]:
+    """
+    Borrow a database connection from the pool.
+    
+    Connections are in autocommit mode. Any transaction the caller left
+    open is rolled back before the connection is returned to the pool.
+    """
+    try:
+        conn = _db_pool.get_nowait()
+    except queue.Empty:
+        conn = _connect_db()
+    
+    try:
+        yield conn
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            _db_pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+
 def init_database() -> None:
     """Initialize the SQLite database with required tables."""
     os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
@@ -93,8 +265,19 @@ def init_database() -> None:
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     
-    # Queue table for model download requests
-    cursor.execute("""
+    # WAL lets /api/queue and /api/tags read while the queue is being written.
+    # The journal mode is persistent, so process-queue.sh's sqlite3 calls use it too.
+    cursor.execute("PRAGMA journal_mode=WAL")
+    journal_mode = cursor.fetchone()[0]
+    if journal_mode.lower() != "wal":
+        logger.warning(f"Could not enable WAL mode, using journal_mode={journal_mode}")
+    
+    # Schema and indexes are created in one transaction (left open for the
+    # migration below and committed at the end)
+    cursor.executescript("""
+        BEGIN;
+        
+        -- Queue table for model download requests
         CREATE TABLE IF NOT EXISTS queue (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             model TEXT NOT NULL,
@@ -104,7 +287,35 @@ def init_database() -> None:
             error TEXT,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
+        );
+        
+        -- Rate limiting table
+        CREATE TABLE IF NOT EXISTS rate_limits (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ip_address TEXT NOT NULL,
+            request_date DATE NOT NULL,
+            request_count INTEGER DEFAULT 1,
+            UNIQUE(ip_address, request_date)
+        );
+        
+        -- Indexes for faster lookups
+        CREATE INDEX IF NOT EXISTS idx_queue_status ON queue(status);
+        CREATE INDEX IF NOT EXISTS idx_queue_model ON queue(model);
+        
+        -- Duplicated the UNIQUE(ip_address, request_date) index, making
+        -- every rate-limit write update two b-trees
+        DROP INDEX IF EXISTS idx_rate_limits_ip_date;
+        
+        -- Partial indexes matching the two lists shown by /api/queue
+        CREATE INDEX IF NOT EXISTS idx_queue_active ON queue(created_at)
+            WHERE status IN ('pending', 'downloading');
+        CREATE INDEX IF NOT EXISTS idx_queue_recent ON queue(updated_at)
+            WHERE status IN ('completed', 'failed');
+        
+        -- Covers the pending list merged into /api/tags and read by
+        -- process-queue.sh, in queue order
+        CREATE INDEX IF NOT EXISTS idx_queue_pending ON queue(created_at, model)
+            WHERE status = 'pending';
     """)
     
     # Migration: add type column if it doesn't exist
@@ -114,26 +325,19 @@ def init_database() -> None:
         cursor.execute("ALTER TABLE queue ADD COLUMN type TEXT DEFAULT 'ollama'")
         logger.info("Added 'type' column to queue table")
     
-    # Rate limiting table
+    # Migration: a model can only be pending once. Drop duplicates left by
+    # older versions (keeping the oldest) before adding the unique index.
     cursor.execute("""
-        CREATE TABLE IF NOT EXISTS rate_limits (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            ip_address TEXT NOT NULL,
-            request_date DATE NOT NULL,
-            request_count INTEGER DEFAULT 1,
-            UNIQUE(ip_address, request_date)
+        DELETE FROM queue
+        WHERE status = 'pending' AND id NOT IN (
+            SELECT MIN(id) FROM queue WHERE status = 'pending' GROUP BY model
         )
     """)
-    
-    # Index for faster lookups
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_queue_status ON queue(status)
-    """)
+    if cursor.rowcount > 0:
+        logger.info(f"Removed {cursor.rowcount} duplicate pending queue entries")
     cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_queue_model ON queue(model)
-    """)
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_rate_limits_ip_date ON rate_limits(ip_address, request_date)
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_queue_unique_pending
+        ON queue(model) WHERE status = 'pending'
     """)
     
     conn.commit()
@@ -141,168 +345,305 @@ def init_database() -> None:
     logger.info(f"Database initialized at {DB_PATH}")
 
 
-def check_rate_limit(ip_address: str) -> tuple[bool, int]:
+class DatabaseWriter:
     """
-    Check if an IP address has exceeded the rate limit.
+    Runs request-path database writes on a single background thread.
     
-    Args:
-        ip_address: The client's IP address
-        
-    Returns:
-        Tuple of (is_allowed, remaining_requests)
+    SQLite allows one writer at a time, so instead of handler threads
+    contending for the write lock, writes are queued and applied by one
+    thread. Writes that arrive together are committed in one transaction;
+    each runs in its own savepoint so a failing write doesn't affect the
+    rest of its batch.
     """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    today = date.today().isoformat()
-    
-    cursor.execute("""
-        SELECT request_count FROM rate_limits
-        WHERE ip_address = ? AND request_date = ?
-    """, (ip_address, today))
     
-    row = cursor.fetchone()
-    current_count = row[0] if row else 0
+    def __init__(self) -> None:
+        self._queue: queue.Queue = queue.Queue(maxsize=DB_WRITE_QUEUE_SIZE)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
     
-    conn.close()
-    
-    remaining = max(0, RATE_LIMIT - current_count)
-    is_allowed = current_count < RATE_LIMIT
+    def submit(self, fn: Callable[[sqlite3.Connection], Any]) -> Future:
+        """Queue fn(conn) to run on the writer thread; blocks while the queue is full."""
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+                    self._thread.start()
+        
+        future: Future = Future()
+        self._queue.put((fn, future), timeout=DB_WRITE_TIMEOUT)
+        return future
     
-    return is_allowed, remaining
+    def execute(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        """
+        Run fn(conn) on the writer thread and wait for its committed result.
+        
+        Raises one of DB_WRITE_ERRORS if the write was not applied. A write
+        still queued after DB_WRITE_TIMEOUT is cancelled, so a caller told
+        it failed never sees it committed later; one already running is
+        waited for instead.
+        """
+        future = self.submit(fn)
+        try:
+            return future.result(timeout=DB_WRITE_TIMEOUT)
+        except FutureTimeoutError:
+            if not future.cancel():
+                return future.result()
+            raise TimeoutError(f"Database write still queued after {DB_WRITE_TIMEOUT}s")
+    
+    def _run(self) -> None:
+        conn = _connect_db()
+        
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + DB_WRITE_DELAY
+            while len(batch) < DB_WRITE_BATCH:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            
+            done = []
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                for fn, future in batch:
+                    # Skip writes whose caller has given up on them
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    conn.execute("SAVEPOINT write")
+                    try:
+                        result = fn(conn)
+                    except Exception as e:
+                        conn.execute("ROLLBACK TO write")
+                        future.set_exception(e)
+                    else:
+                        done.append((future, result))
+                    conn.execute("RELEASE write")
+                conn.execute("COMMIT")
+            except Exception as e:
+                logger.error(f"Database write batch failed: {e}")
+                if conn.in_transaction:
+                    conn.rollback()
+                for fn, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            # Results are only handed out once they are committed
+            for future, result in done:
+                future.set_result(result)
 
 
-def increment_rate_limit(ip_address: str) -> None:
-    """Increment the rate limit counter for an IP address."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+_db_writer = DatabaseWriter()
+
+
+_today_cache = {"until": 0.0, "s": ""}
+
+
+def today_iso() -> str:
+    """Today's date as YYYY-MM-DD, recomputed once the day changes."""
+    if time.time() >= _today_cache["until"]:
+        today = date.today()
+        midnight = datetime.combine(today + timedelta(days=1), datetime.min.time())
+        # Date first, so a reader that sees the new deadline gets the new date
+        _today_cache.update(s=today.isoformat(), until=midnight.timestamp())
+    return _today_cache["s"]
+
+
+_now_cache = {"t": 0, "s": ""}
+
+
+def now_iso() -> str:
+    """The current local time in ISO format, at one-second resolution."""
+    now = int(time.time())
+    if now != _now_cache["t"]:
+        _now_cache.update(s=datetime.fromtimestamp(now).isoformat(), t=now)
+    return _now_cache["s"]
+
+
+def atomic_consume_quota(conn: sqlite3.Connection, ip_address: str) -> Optional[int]:
+    """
+    Consume one request from an IP address's daily quota.
     
-    today = date.today().isoformat()
+    The check and the increment are a single UPSERT, so concurrent requests
+    from the same IP cannot both pass the limit.
     
-    cursor.execute("""
+    Args:
+        conn: Database connection (may be inside an open transaction)
+        ip_address: The client's IP address
+        
+    Returns:
+        Remaining requests after this one, or None if the limit is exhausted
+    """
+    if RATE_LIMIT <= 0:
+        return None
+    
+    today = today_iso()
+    
+    row = conn.execute("""
         INSERT INTO rate_limits (ip_address, request_date, request_count)
         VALUES (?, ?, 1)
         ON CONFLICT(ip_address, request_date)
         DO UPDATE SET request_count = request_count + 1
-    """, (ip_address, today))
+        WHERE request_count < ?
+        RETURNING request_count
+    """, (ip_address, today, RATE_LIMIT)).fetchone()
     
-    conn.commit()
-    conn.close()
+    if row is None:
+        return None
+    return max(0, RATE_LIMIT - row[0])
 
 
-def is_model_in_queue(model: str) -> bool:
-    """Check if a model is already in the pending queue."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+def quota_remaining(ip_address: str) -> int:
+    """
+    Get how many requests an IP address has left today.
     
-    cursor.execute("""
-        SELECT COUNT(*) FROM queue
-        WHERE model = ? AND status = 'pending'
-    """, (model,))
+    A read-only early check so rate-limited clients are turned away before
+    any backend or disk work; atomic_consume_quota() stays authoritative.
+    """
+    if RATE_LIMIT <= 0:
+        return 0
     
-    count = cursor.fetchone()[0]
-    conn.close()
+    with get_conn() as conn:
+        row = conn.execute("""
+            SELECT request_count FROM rate_limits
+            WHERE ip_address = ? AND request_date = ?
+        """, (ip_address, today_iso())).fetchone()
+    
+    return RATE_LIMIT if row is None else max(0, RATE_LIMIT - row[0])
+
+
+def is_model_queued(model: str) -> bool:
+    """Check whether a model is already pending in the queue."""
+    with get_conn() as conn:
+        row = conn.execute("""
+            SELECT 1 FROM queue INDEXED BY idx_queue_unique_pending
+            WHERE model = ? AND status = 'pending'
+        """, (model,)).fetchone()
     
-    return count > 0
+    return row is not None
 
 
-def add_to_queue(model: str, ip_address: str) -> dict:
+def add_to_queue(model: str, ip_address: str, queue_type: str = "ollama") -> dict:
     """
-    Add a model to the download queue.
+    Add an entry to the download queue, charging it to the requester's quota.
+    
+    Quota and insert run together on the database writer thread, inside one
+    transaction. Duplicates are caught by the unique index on pending
+    models, and their quota is handed back.
     
     Args:
-        model: The model name to queue
+        model: Value stored in the queue's model column
         ip_address: The requester's IP address
+        queue_type: Entry type ('ollama', 'huggingface' or 'docker')
         
     Returns:
-        Dict with queue status information
+        Dict with status ('queued', 'already_queued' or 'rate_limited'),
+        remaining requests and, when queued, the queue_id
     """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    # Check if already queued (deduplication)
-    if is_model_in_queue(model):
-        conn.close()
-        return {
-            "status": "already_queued",
-            "message": f"Model {model} is already in the download queue"
-        }
-    
-    # Add to queue
-    cursor.execute("""
-        INSERT INTO queue (model, requester_ip, status)
-        VALUES (?, ?, 'pending')
-    """, (model, ip_address))
-    
-    queue_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    
-    # Increment rate limit
-    increment_rate_limit(ip_address)
-    
-    logger.info(f"Queued model {model} (id={queue_id}) from {ip_address}")
+    def write(conn: sqlite3.Connection) -> dict:
+        remaining = atomic_consume_quota(conn, ip_address)
+        if remaining is None:
+            return {"status": "rate_limited", "remaining": 0}
+        
+        row = conn.execute("""
+            INSERT INTO queue (model, type, requester_ip, status)
+            VALUES (?, ?, ?, 'pending')
+            ON CONFLICT DO NOTHING
+            RETURNING id
+        """, (model, queue_type, ip_address)).fetchone()
+        
+        if row is None:
+            # Already pending - give the request back
+            conn.execute("""
+                UPDATE rate_limits SET request_count = request_count - 1
+                WHERE ip_address = ? AND request_date = ?
+            """, (ip_address, today_iso()))
+            return {"status": "already_queued", "remaining": remaining + 1}
+        
+        return {"status": "queued", "remaining": remaining, "queue_id": row[0]}
+    
+    return _db_writer.execute(write)
+
+
+def delete_pending(model: str) -> int:
+    """Remove pending queue entries for a model; returns the number removed."""
+    return _db_writer.execute(lambda conn: conn.execute("""
+        DELETE FROM queue 
+        WHERE model = ? AND status = 'pending'
+    """, (model,)).rowcount)
+
+
+def delete_completed(model: str) -> int:
+    """
+    Remove completed Ollama entries for a model deleted from the backend.
     
-    return {
-        "status": "queued",
-        "message": f"Model {model} added to download queue",
-        "queue_id": queue_id
-    }
+    Without this, verify_completed_models() would find the model missing
+    and queue it again. An untagged name and its :latest tag are the same
+    model. Returns the number of entries removed.
+    """
+    name, _, tag = model.partition(":")
+    names = (name, f"{name}:latest") if tag in ("", "latest") else (model, model)
+    return _db_writer.execute(lambda conn: conn.execute("""
+        DELETE FROM queue
+        WHERE model IN (?, ?) AND status = 'completed' AND type = 'ollama'
+    """, names).rowcount)
 
 
 def get_queue_status() -> dict:
     """Get the current queue status."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    # Get counts by status
-    cursor.execute("""
-        SELECT status, COUNT(*) FROM queue
-        GROUP BY status
-    """)
-    status_counts = dict(cursor.fetchall())
-    
-    # Get pending items
-    cursor.execute("""
-        SELECT id, model, type, requester_ip, status, created_at, updated_at
-        FROM queue
-        WHERE status IN ('pending', 'downloading')
-        ORDER BY created_at ASC
-        LIMIT 50
-    """)
-    
+    # Counts, active items and recent results in one statement; the first
+    # column tells the row sets apart. Without ANALYZE statistics the planner
+    # prefers idx_queue_status plus a sort, so the partial indexes are named.
+    with get_conn() as conn:
+        rows = conn.execute("""
+            SELECT 'count', NULL, NULL, NULL, NULL, status, NULL, NULL, NULL, COUNT(*)
+            FROM queue
+            GROUP BY status
+            UNION ALL
+            SELECT * FROM (
+                SELECT 'queue', id, model, type, requester_ip, status, NULL, created_at, updated_at, NULL
+                FROM queue INDEXED BY idx_queue_active
+                WHERE status IN ('pending', 'downloading')
+                ORDER BY created_at ASC
+                LIMIT 50
+            )
+            UNION ALL
+            SELECT * FROM (
+                SELECT 'recent', id, model, NULL, NULL, status, error, NULL, updated_at, NULL
+                FROM queue INDEXED BY idx_queue_recent
+                WHERE status IN ('completed', 'failed')
+                ORDER BY updated_at DESC
+                LIMIT 10
+            )
+        """).fetchall()
+    
+    status_counts = {}
     pending = []
-    for row in cursor.fetchall():
-        pending.append({
-            "id": row[0],
-            "model": row[1],
-            "type": row[2] or "ollama",
-            "requester_ip": row[3],
-            "status": row[4],
-            "created_at": row[5],
-            "updated_at": row[6]
-        })
-    
-    # Get recent completed/failed
-    cursor.execute("""
-        SELECT id, model, status, error, updated_at
-        FROM queue
-        WHERE status IN ('completed', 'failed')
-        ORDER BY updated_at DESC
-        LIMIT 10
-    """)
-    
     recent = []
-    for row in cursor.fetchall():
-        recent.append({
-            "id": row[0],
-            "model": row[1],
-            "status": row[2],
-            "error": row[3],
-            "updated_at": row[4]
-        })
-    
-    conn.close()
+    for kind, queue_id, model, model_type, requester_ip, status, error, created_at, updated_at, count in rows:
+        if kind == "count":
+            status_counts[status] = count
+        elif kind == "queue":
+            pending.append({
+                "id": queue_id,
+                "model": model,
+                "type": model_type or "ollama",
+                "requester_ip": requester_ip,
+                "status": status,
+                "created_at": created_at,
+                "updated_at": updated_at
+            })
+        else:
+            recent.append({
+                "id": queue_id,
+                "model": model,
+                "status": status,
+                "error": error,
+                "updated_at": updated_at
+            })
     
     return {
         "counts": {
@@ -316,7 +657,39 @@ def get_queue_status() -> dict:
     }
 
 
-def cleanup_orphaned_downloads() -> int:
+_queue_json_lock = threading.Lock()
+_queue_json = {"token": None, "body": b""}
+
+
+def get_queue_status_json() -> bytes:
+    """
+    Get the current queue status as encoded JSON.
+    
+    The encoded body is reused while a cheap summary of the queue (row
+    counts, newest id and latest update per status) is unchanged, so
+    frequent polling of /api/queue doesn't rebuild the same response.
+    """
+    with get_conn() as conn:
+        token = conn.execute("""
+            SELECT status, COUNT(*), MAX(id), MAX(updated_at)
+            FROM queue
+            GROUP BY status
+        """).fetchall()
+    
+    with _queue_json_lock:
+        if _queue_json["token"] == token:
+            return _queue_json["body"]
+    
+    # Read after the token: a change in between only makes the cached
+    # body newer than its token, which the next call then replaces
+    body = _dumps(get_queue_status())
+    with _queue_json_lock:
+        _queue_json.update(token=token, body=body)
+    
+    return body
+
+
+def cleanup_orphaned_downloads(conn: sqlite3.Connection) -> int:
     """
     Reset any 'downloading' status to 'pending' on startup.
     
@@ -326,18 +699,12 @@ def cleanup_orphaned_downloads() -> int:
     Returns:
         Number of orphaned entries reset.
     """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        UPDATE queue
+    # OR REPLACE: if the model was re-queued meanwhile, keep a single entry
+    count = conn.execute("""
+        UPDATE OR REPLACE queue
         SET status = 'pending', updated_at = datetime('now')
         WHERE status = 'downloading'
-    """)
-    
-    count = cursor.rowcount
-    conn.commit()
-    conn.close()
+    """).rowcount
     
     if count > 0:
         logger.info(f"Reset {count} orphaned 'downloading' entries to 'pending'")
@@ -345,25 +712,18 @@ def cleanup_orphaned_downloads() -> int:
     return count
 
 
-def cleanup_old_entries() -> int:
+def cleanup_old_entries(conn: sqlite3.Connection) -> int:
     """
     Remove completed/failed entries older than CLEANUP_DAYS.
     
     Returns:
         Number of entries removed.
     """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute("""
+    count = conn.execute("""
         DELETE FROM queue
         WHERE status IN ('completed', 'failed')
         AND updated_at < datetime('now', ?)
-    """, (f'-{CLEANUP_DAYS} days',))
-    
-    count = cursor.rowcount
-    conn.commit()
-    conn.close()
+    """, (f'-{CLEANUP_DAYS} days',)).rowcount
     
     if count > 0:
         logger.info(f"Cleaned up {count} old entries (older than {CLEANUP_DAYS} days)")
@@ -371,87 +731,358 @@ def cleanup_old_entries() -> int:
     return count
 
 
+def cleanup_old_rate_limits(conn: sqlite3.Connection) -> int:
+    """
+    Remove rate-limit rows older than RATE_LIMIT_RETENTION_DAYS.
+    
+    Returns:
+        Number of rows removed.
+    """
+    count = conn.execute(
+        "DELETE FROM rate_limits WHERE request_date < date('now', ?)",
+        (f'-{RATE_LIMIT_RETENTION_DAYS} days',)
+    ).rowcount
+    
+    if count > 0:
+        logger.info(f"Cleaned up {count} old rate-limit rows")
+    
+    return count
+
+
+def startup_maintenance() -> None:
+    """Reset orphaned downloads and purge old rows in a single transaction."""
+    with get_conn() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        cleanup_orphaned_downloads(conn)
+        cleanup_old_entries(conn)
+        cleanup_old_rate_limits(conn)
+        # Statistics let the planner pick the partial indexes, including
+        # for process-queue.sh's queries
+        conn.execute("ANALYZE")
+        conn.execute("COMMIT")
+
+
+def run_maintenance() -> None:
+    """
+    Periodically verify completed models, purge old rows and checkpoint the WAL.
+    
+    Runs in a daemon thread every MAINTENANCE_INTERVAL seconds, so a
+    long-running proxy doesn't keep every day's rate-limit rows and
+    finished queue entries until the next restart. The first verification
+    runs right away, so startup doesn't wait on the backend for it.
+    """
+    while True:
+        try:
+            verify_completed_models()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not verify completed models: {e}")
+        
+        time.sleep(MAINTENANCE_INTERVAL)
+        try:
+            with get_conn() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                cleanup_old_entries(conn)
+                cleanup_old_rate_limits(conn)
+                conn.execute("ANALYZE")
+                conn.execute("COMMIT")
+                conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        except sqlite3.Error as e:
+            logger.warning(f"Database maintenance failed: {e}")
+
+
 def verify_completed_models() -> int:
     """
     Verify that 'completed' models actually exist in Ollama.
     
     If a model is marked 'completed' but doesn't exist in Ollama,
-    reset it to 'pending' so it gets re-downloaded.
+    reset it to 'pending' so it gets re-downloaded. Only Ollama pulls are
+    checked; Docker images and HuggingFace conversions aren't listed by
+    /api/tags under their queue names.
     
     Returns:
         Number of entries reset to pending.
     """
     # Get list of actual models from Ollama
-    actual_models = set()
     try:
-        url = f"{OLLAMA_BACKEND}/api/tags"
-        req = urllib.request.Request(url)
-        with urllib.request.urlopen(req, timeout=10) as response:
-            data = json.loads(response.read().decode())
-            for m in data.get("models", []):
-                name = m.get("name", "")
-                actual_models.add(name)
-                actual_models.add(name.split(":")[0])  # Also add base name
+        names, bases = store_tags(_loads(fetch_tags()))
+        actual_models = names | bases  # Also match base names
     except Exception as e:
         logger.warning(f"Could not verify completed models: {e}")
         return 0
     
-    # Check completed entries against actual models
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    # Reset orphaned entries to pending in one statement; the names are
+    # loaded into a temp table so the matching happens inside SQLite
+    with get_conn() as conn:
+        conn.execute("CREATE TEMP TABLE real_models(name TEXT PRIMARY KEY)")
+        try:
+            conn.executemany(
+                "INSERT INTO real_models VALUES (?)",
+                [(name,) for name in actual_models],
+            )
+            cursor = conn.execute("""
+                UPDATE OR REPLACE queue
+                SET status = 'pending', updated_at = datetime('now')
+                WHERE status = 'completed' AND type = 'ollama'
+                AND model NOT IN (SELECT name FROM real_models)
+                AND substr(model, 1, instr(model || ':', ':') - 1)
+                    NOT IN (SELECT name FROM real_models)
+            """)
+            reset_count = cursor.rowcount
+        finally:
+            conn.execute("DROP TABLE temp.real_models")
+    
+    if reset_count:
+        logger.info(f"Reset {reset_count} orphaned 'completed' entries to 'pending'")
+    
+    return reset_count
+
+
+_tags_cache_lock = threading.Lock()
+_tags_cache = {"ts": 0.0, "names": frozenset(), "bases": frozenset()}
+
+# "details" of the synthetic /api/tags entries for queued models; shared
+# by all entries, which are encoded right away and never modified
+QUEUED_MODEL_DETAILS = {
+    "parent_model": "",
+    "format": "pending",
+    "family": "queued",
+    "families": ["queued"],
+    "parameter_size": "unknown",
+    "quantization_level": "N/A"
+}
+
+# Merged /api/tags body, keyed on the backend listing and pending models
+_tags_response = {"ts": 0.0, "key": None, "body": b""}
+
+
+def invalidate_tags_cache() -> None:
+    """Force the next check_model_exists() call and /api/tags request to refetch the model list."""
+    with _tags_cache_lock:
+        _tags_cache["ts"] = 0.0
+        _tags_response["ts"] = 0.0
+
+
+def cached_tags() -> Optional[tuple[frozenset, frozenset]]:
+    """Return the cached (names, base names) from /api/tags if still fresh."""
+    with _tags_cache_lock:
+        if time.monotonic() - _tags_cache["ts"] < TAGS_CACHE_TTL:
+            return _tags_cache["names"], _tags_cache["bases"]
+    return None
+
+
+def store_tags(data: dict) -> tuple[frozenset, frozenset]:
+    """Cache the model names from an /api/tags response and return them."""
+    model_names = [m.get("name", "") for m in data.get("models", [])]
+    names = frozenset(model_names)
+    bases = frozenset(name.partition(":")[0] for name in model_names)
     
-    cursor.execute("""
-        SELECT id, model FROM queue WHERE status = 'completed'
-    """)
+    with _tags_cache_lock:
+        _tags_cache.update(ts=time.monotonic(), names=names, bases=bases)
     
-    orphaned_ids = []
-    for row in cursor.fetchall():
-        queue_id, model = row
-        model_base = model.split(":")[0]
-        if model not in actual_models and model_base not in actual_models:
-            orphaned_ids.append(queue_id)
-            logger.info(f"Model '{model}' marked completed but not found in Ollama")
-    
-    # Reset orphaned entries to pending
-    if orphaned_ids:
-        placeholders = ",".join("?" * len(orphaned_ids))
-        cursor.execute(f"""
-            UPDATE queue
-            SET status = 'pending', updated_at = datetime('now')
-            WHERE id IN ({placeholders})
-        """, orphaned_ids)
-        conn.commit()
-        logger.info(f"Reset {len(orphaned_ids)} orphaned 'completed' entries to 'pending'")
+    return names, bases
+
+
+_tags_fetch_lock = threading.Lock()
+_tags_fetched = {"ts": 0.0, "raw": b""}
+
+
+def fetch_tags() -> bytes:
+    """
+    Fetch the raw /api/tags listing from the backend.
     
-    conn.close()
-    return len(orphaned_ids)
+    Concurrent callers share one request: a caller that had to wait for
+    another thread's fetch uses its result instead of fetching again.
+    
+    Raises:
+        OSError or http.client.HTTPException if the backend can't be reached
+        or doesn't answer 200
+    """
+    started = time.monotonic()
+    with _tags_fetch_lock:
+        if _tags_fetched["ts"] >= started:
+            return _tags_fetched["raw"]
+        
+        status, raw = backend_request("GET", "/api/tags")
+        if status != 200:
+            raise http.client.HTTPException(f"/api/tags returned {status}")
+        
+        _tags_fetched.update(ts=time.monotonic(), raw=raw)
+        return raw
 
 
-def check_model_exists(model: str) -> bool:
-    """Check if a model already exists in Ollama."""
-    try:
-        url = f"{OLLAMA_BACKEND}/api/tags"
-        req = urllib.request.Request(url)
+def model_in_tags(model: str, model_base: str) -> bool:
+    """
+    Check a model against the backend's /api/tags listing.
+    
+    The model list is cached for TAGS_CACHE_TTL seconds so that bursts of
+    requests don't each fetch and parse /api/tags.
+    """
+    names, bases = cached_tags() or (None, None)
+    
+    if names is None:
+        try:
+            data = _loads(fetch_tags())
+        except Exception as e:
+            logger.warning(f"Error checking model existence: {e}")
+            return False
         
-        with urllib.request.urlopen(req, timeout=10) as response:
-            data = json.loads(response.read().decode())
-            models = data.get("models", [])
-            
-            # Normalize model name for comparison
-            model_base = model.split(":")[0]
-            
-            for m in models:
-                m_name = m.get("name", "")
-                m_base = m_name.split(":")[0]
-                
-                # Check exact match or base name match
-                if m_name == model or m_base == model_base:
-                    return True
-                    
+        names, bases = store_tags(data)
+    
+    # Check exact match or base name match
+    return model in names or model_base in bases
+
+
+def check_backend_health() -> dict:
+    """Check that the backend answers /api/tags, for /api/health."""
+    try:
+        status, _ = backend_request("GET", "/api/tags", timeout=5)
+        if status != 200:
+            raise http.client.HTTPException(f"/api/tags returned {status}")
+        return {"status": "ok", "url": OLLAMA_BACKEND}
+    except Exception as e:
+        return {"status": "error", "url": OLLAMA_BACKEND, "error": str(e)}
+
+
+_health_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="health")
+
+
+def check_model_exists(model: str, model_base: Optional[str] = None) -> bool:
+    """
+    Check if a model already exists in Ollama.
+    
+    Asks the backend about this one model via POST /api/show (200: exists,
+    404: missing) instead of listing every model. Any other status falls
+    back to the /api/tags listing, where model_base (the name without its
+    tag) also counts as a match. Models in a still-fresh cached listing are
+    answered without asking the backend.
+    """
+    if model_base is None:
+        model_base = model.partition(":")[0]
+    
+    tags = cached_tags()
+    if tags is not None:
+        # An installed model listed by a fresh tag listing (untagged names
+        # are listed as name:latest) needs no backend round-trip
+        if model in tags[0] or (model == model_base and f"{model}:latest" in tags[0]):
+            return True
+        # Namespaced names (user/model, hf.co/org/repo) are usually new
+        # pulls; if the listing doesn't have them, skip the round-trip too
+        if "/" in model and model_base not in tags[1]:
+            return False
+    
+    try:
+        status, _ = backend_request("POST", "/api/show", {"model": model, "name": model})
     except Exception as e:
         logger.warning(f"Error checking model existence: {e}")
+        return False
     
-    return False
+    if status == 200:
+        return True
+    if status == 404:
+        return False
+    
+    logger.debug(f"/api/show returned {status} for {model}, checking tags")
+    return model_in_tags(model, model_base)
+
+
+def backend_connection(timeout: float) -> http.client.HTTPConnection:
+    """Open a new connection to the Ollama backend."""
+    if _BACKEND_URL.scheme == "https":
+        return http.client.HTTPSConnection(_BACKEND_URL.hostname, _BACKEND_URL.port, timeout=timeout)
+    return http.client.HTTPConnection(_BACKEND_URL.hostname, _BACKEND_URL.port, timeout=timeout)
+
+
+_backend_pool: queue.LifoQueue = queue.LifoQueue(maxsize=BACKEND_POOL_SIZE)
+
+
+def acquire_backend_connection(timeout: float = 300) -> tuple[http.client.HTTPConnection, bool]:
+    """
+    Get a connection to the backend, reusing an idle keep-alive one if possible.
+    
+    Returns:
+        Tuple of (connection, reused)
+    """
+    while True:
+        try:
+            conn = _backend_pool.get_nowait()
+        except queue.Empty:
+            return backend_connection(timeout=timeout), False
+        
+        # An idle socket that is readable has been closed by the backend
+        if conn.sock is not None and not select.select([conn.sock], [], [], 0)[0]:
+            conn.timeout = timeout
+            conn.sock.settimeout(timeout)
+            return conn, True
+        conn.close()
+
+
+def release_backend_connection(conn: http.client.HTTPConnection) -> None:
+    """Return a connection whose response was fully read to the pool."""
+    try:
+        _backend_pool.put_nowait(conn)
+    except queue.Full:
+        conn.close()
+
+
+_buffer_pool: queue.LifoQueue = queue.LifoQueue(maxsize=BUFFER_POOL_SIZE)
+
+
+@contextmanager
+def copy_buffer() -> Iterator[memoryview]:
+    """
+    Borrow a PROXY_CHUNK_SIZE buffer for copying a body with readinto().
+    
+    Buffers are reused across requests instead of allocating a new bytes
+    object for every chunk of a multi-gigabyte transfer.
+    """
+    try:
+        buf = _buffer_pool.get_nowait()
+    except queue.Empty:
+        buf = memoryview(bytearray(PROXY_CHUNK_SIZE))
+    
+    try:
+        yield buf
+    finally:
+        try:
+            _buffer_pool.put_nowait(buf)
+        except queue.Full:
+            pass
+
+
+def backend_request(method: str, path: str, payload: Optional[dict] = None,
+                    timeout: float = 10) -> tuple[int, bytes]:
+    """
+    Make a small request to the backend over a pooled keep-alive connection.
+    
+    The whole response is read so the connection can be reused. A reused
+    connection that turns out to be closed is retried on a fresh one.
+    
+    Returns:
+        Tuple of (status, body)
+    """
+    body = _dumps(payload) if payload is not None else None
+    headers = {"Content-Type": "application/json"} if body is not None else {}
+    
+    while True:
+        conn, reused = acquire_backend_connection(timeout)
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            data = response.read()
+        except (ConnectionError, http.client.BadStatusLine):
+            conn.close()
+            if reused:
+                continue
+            raise
+        except Exception:
+            conn.close()
+            raise
+        
+        if response.will_close:
+            conn.close()
+        else:
+            release_backend_connection(conn)
+        return response.status, data
 
 
 def validate_docker_image(image: str) -> tuple[bool, str | None]:
@@ -512,83 +1143,234 @@ def validate_docker_image(image: str) -> tuple[bool, str | None]:
 class OhhhllamaHandler(http.server.BaseHTTPRequestHandler):
     """HTTP request handler for the ohhhllama proxy."""
     
+    # Buffer writes so headers and small bodies leave in one send(); streamed
+    # proxy responses flush after every chunk
+    wbufsize = PROXY_CHUNK_SIZE
+    
+    # Small JSON responses and streamed chunks should not wait on Nagle
+    disable_nagle_algorithm = True
+    
+    # Keep client connections open between requests; every response carries
+    # a Content-Length or is sent chunked
+    protocol_version = "HTTP/1.1"
+    
+    def handle_one_request(self) -> None:
+        """Wait at most CLIENT_IDLE_TIMEOUT for the next request on this connection."""
+        self.connection.settimeout(CLIENT_IDLE_TIMEOUT)
+        super().handle_one_request()
+    
+    def parse_request(self) -> bool:
+        """Parse the request line and headers, then allow the request more time."""
+        if not super().parse_request():
+            return False
+        try:
+            self.content_length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            self.content_length = -1
+        if self.content_length < 0:
+            self.send_error(400, "Bad Content-Length")
+            return False
+        self.connection.settimeout(CLIENT_TIMEOUT)
+        # Chunked request bodies are not read, so the connection can't be reused
+        if "Transfer-Encoding" in self.headers:
+            self.close_connection = True
+        return True
+    
     def log_message(self, format: str, *args) -> None:
         """Override to use our logger."""
-        logger.info(f"{self.address_string()} - {format % args}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"{self.address_string()} - {format % args}")
     
     def get_client_ip(self) -> str:
         """Get the client's IP address, considering X-Forwarded-For."""
         forwarded = self.headers.get("X-Forwarded-For")
         if forwarded:
             return forwarded.split(",")[0].strip()
-        return self.client_address[0]
+        return self.address_string()
+    
+    def address_string(self) -> str:
+        """Get the peer's IP address, without the IPv4-mapped IPv6 prefix."""
+        # IPv4 clients of the dual-stack socket appear as ::ffff:a.b.c.d;
+        # rate limits and logs keep using the plain IPv4 address
+        host = self.client_address[0]
+        return host[7:] if host.startswith("::ffff:") else host
     
     def send_json_response(self, status_code: int, data: dict) -> None:
         """Send a JSON response."""
-        body = json.dumps(data).encode()
+        self.send_json_bytes(status_code, _dumps(data))
+    
+    def send_rate_limited(self, client_ip: str) -> None:
+        """Send the 429 response for a client over its daily limit."""
+        logger.warning(f"Rate limit exceeded for {client_ip}")
+        self.send_json_response(429, {
+            "error": "Rate limit exceeded",
+            "message": f"Maximum {RATE_LIMIT} model requests per day",
+            "remaining": 0
+        })
+    
+    def send_write_failed(self, error: Exception) -> None:
+        """Send the 503 response for a queue write that was not applied."""
+        logger.error(f"Queue database write failed: {error!r}")
+        self.send_json_response(503, {
+            "error": "Queue database busy",
+            "message": "The request was not applied, please retry"
+        })
+    
+    def send_json_bytes(self, status_code: int, body: bytes) -> None:
+        """Send an already encoded JSON response."""
         self.send_response(status_code)
         self.send_header("Content-Type", "application/json")
         self.send_header("Content-Length", str(len(body)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
         self.end_headers()
         self.wfile.write(body)
     
-    def proxy_request(self, method: str, body: Optional[bytes] = None) -> None:
-        """Proxy a request to the Ollama backend."""
-        url = f"{OLLAMA_BACKEND}{self.path}"
+    def send_to_backend(self, conn: http.client.HTTPConnection, method: str, body: Optional[bytes]) -> None:
+        """Send this request's line, headers and body to the backend."""
+        conn.putrequest(method, self.path, skip_accept_encoding=True)
+        
+        # Copy headers (except Host, Content-Length and hop-by-hop headers)
+        for header, value in self.headers.items():
+            if header.lower() not in REQUEST_SKIPPED_HEADERS:
+                conn.putheader(header, value)
+        
+        if body is not None:
+            conn.putheader("Content-Length", str(len(body)))
+            conn.endheaders(body)
+            return
+        
+        remaining = self.content_length
+        if remaining > 0:
+            conn.putheader("Content-Length", str(remaining))
+        conn.endheaders()
+        if remaining <= 0:
+            return
+        
+        # Stream request body, forwarding whatever has arrived without
+        # waiting for a full chunk
+        with copy_buffer() as buf:
+            while remaining > 0:
+                n = self.rfile.readinto1(buf[:min(PROXY_CHUNK_SIZE, remaining)])
+                if not n:
+                    break
+                conn.send(buf[:n])
+                remaining -= n
+    
+    def proxy_request(self, method: str, body: Optional[bytes] = None) -> Optional[int]:
+        """
+        Proxy a request to the Ollama backend.
+        
+        If body is None, the client's request body is streamed to the backend
+        as it is read instead of being buffered first. The response is
+        streamed back the same way. Backend connections are kept alive and
+        reused; if a reused connection turns out to be closed, a request
+        whose body can be resent is retried once on a fresh connection.
+        
+        Returns the backend's status once its response has been relayed in
+        full, or None if proxying failed.
+        """
+        replayable = body is not None or self.content_length == 0
+        conn = None
+        headers_sent = False
+        status = None
         
         try:
-            req = urllib.request.Request(url, data=body, method=method)
+            while True:
+                conn, reused = acquire_backend_connection()
+                try:
+                    self.send_to_backend(conn, method, body)
+                    response = conn.getresponse()
+                    break
+                except (ConnectionError, http.client.BadStatusLine):
+                    conn.close()
+                    if not (reused and replayable):
+                        raise
             
-            # Copy headers (except Host)
-            for header, value in self.headers.items():
-                if header.lower() not in ("host", "content-length"):
-                    req.add_header(header, value)
+            # A body without a known length is re-chunked for HTTP/1.1
+            # clients; older clients read it until the connection closes
+            chunked = response.length is None and self.request_version == "HTTP/1.1"
+            if response.length is None and not chunked:
+                self.close_connection = True
             
-            with urllib.request.urlopen(req, timeout=300) as response:
-                # Send response status
-                self.send_response(response.status)
-                
-                # Copy response headers
-                for header, value in response.getheaders():
-                    if header.lower() not in ("transfer-encoding",):
-                        self.send_header(header, value)
-                self.end_headers()
-                
-                # Stream response body
+            # Send response status
+            self.send_response(response.status)
+            
+            # Copy response headers
+            for header, value in response.getheaders():
+                if header.lower() not in HOP_BY_HOP_HEADERS:
+                    self.send_header(header, value)
+            if chunked:
+                self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            headers_sent = True
+            
+            if response.length is not None:
+                # Fixed-size body (blobs, JSON): copy in full chunks
+                with copy_buffer() as buf:
+                    while True:
+                        n = response.readinto(buf)
+                        if not n:
+                            break
+                        self.wfile.write(buf[:n])
+            else:
+                # Streamed body; read1 returns whatever has arrived so
+                # generations are forwarded without waiting for a full chunk
                 while True:
-                    chunk = response.read(8192)
+                    chunk = response.read1(PROXY_CHUNK_SIZE)
                     if not chunk:
                         break
-                    self.wfile.write(chunk)
-                    
-        except urllib.error.HTTPError as e:
-            self.send_response(e.code)
-            for header, value in e.headers.items():
-                if header.lower() not in ("transfer-encoding",):
-                    self.send_header(header, value)
-            self.end_headers()
-            self.wfile.write(e.read())
+                    if chunked:
+                        self.wfile.write(b"%x\r\n" % len(chunk))
+                        self.wfile.write(chunk)
+                        self.wfile.write(b"\r\n")
+                    else:
+                        self.wfile.write(chunk)
+                    self.wfile.flush()
+                if chunked:
+                    self.wfile.write(b"0\r\n\r\n")
             
-        except urllib.error.URLError as e:
-            logger.error(f"Backend connection error: {e}")
-            self.send_json_response(502, {
-                "error": "Backend unavailable",
-                "detail": str(e.reason)
-            })
+            # Fully read, so the connection can carry the next request
+            response.close()
+            status = response.status
+            if not response.will_close:
+                release_backend_connection(conn)
+                conn = None
+        
+        except (OSError, http.client.HTTPException) as e:
+            # The request body may be partly unread or the response cut
+            # short, so this client connection can't carry another request
+            self.close_connection = True
+            if headers_sent:
+                logger.warning(f"Proxy stream interrupted: {e}")
+            else:
+                logger.error(f"Backend connection error: {e}")
+                self.send_json_response(502, {
+                    "error": "Backend unavailable",
+                    "detail": str(e)
+                })
             
         except Exception as e:
+            self.close_connection = True
             logger.error(f"Proxy error: {e}")
-            self.send_json_response(500, {
-                "error": "Internal proxy error",
-                "detail": str(e)
-            })
+            if not headers_sent:
+                self.send_json_response(500, {
+                    "error": "Internal proxy error",
+                    "detail": str(e)
+                })
+        
+        finally:
+            if conn is not None:
+                conn.close()
+        
+        return status
     
     def handle_hf_queue_request(self, body: bytes) -> None:
         """Handle POST /api/hf/queue - queue a HuggingFace model for download."""
         client_ip = self.get_client_ip()
         
         try:
-            data = json.loads(body.decode())
+            data = _loads(body)
         except json.JSONDecodeError:
             self.send_json_response(400, {"error": "Invalid JSON"})
             return
@@ -603,31 +1385,6 @@ class OhhhllamaHandler(http.server.BaseHTTPRequestHandler):
         model_name = data.get("name")  # Custom name for Ollama
         convert = data.get("convert", True)  # Default to True for backwards compatibility
         
-        # Check rate limit
-        is_allowed, remaining = check_rate_limit(client_ip)
-        if not is_allowed:
-            self.send_json_response(429, {
-                "error": "Rate limit exceeded",
-                "message": f"Maximum {RATE_LIMIT} model requests per day"
-            })
-            return
-        
-        # Check if already in queue
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT COUNT(*) FROM queue 
-            WHERE model = ? AND type = 'huggingface' AND status = 'pending'
-        """, (repo_id,))
-        
-        if cursor.fetchone()[0] > 0:
-            conn.close()
-            self.send_json_response(200, {
-                "status": "already_queued",
-                "message": f"HuggingFace model {repo_id} is already in queue"
-            })
-            return
-        
         # Add to queue with type='huggingface'
         # Always store as JSON to include all parameters
         model_data = json.dumps({
@@ -637,17 +1394,27 @@ class OhhhllamaHandler(http.server.BaseHTTPRequestHandler):
             "convert": convert
         })
         
-        cursor.execute("""
-            INSERT INTO queue (model, type, requester_ip, status)
-            VALUES (?, 'huggingface', ?, 'pending')
-        """, (model_data, client_ip))
+        try:
+            result = add_to_queue(model_data, client_ip, "huggingface")
+        except DB_WRITE_ERRORS as e:
+            self.send_write_failed(e)
+            return
         
-        queue_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        if result["status"] == "rate_limited":
+            self.send_json_response(429, {
+                "error": "Rate limit exceeded",
+                "message": f"Maximum {RATE_LIMIT} model requests per day"
+            })
+            return
         
-        increment_rate_limit(client_ip)
+        if result["status"] == "already_queued":
+            self.send_json_response(200, {
+                "status": "already_queued",
+                "message": f"HuggingFace model {repo_id} is already in queue"
+            })
+            return
         
+        queue_id = result["queue_id"]
         logger.info(f"Queued HuggingFace model {repo_id} (id={queue_id}) from {client_ip}")
         
         self.send_json_response(202, {
@@ -663,7 +1430,7 @@ class OhhhllamaHandler(http.server.BaseHTTPRequestHandler):
         client_ip = self.get_client_ip()
         
         try:
-            data = json.loads(body.decode())
+            data = _loads(body)
         except json.JSONDecodeError:
             self.send_json_response(400, {"error": "Invalid JSON"})
             return
@@ -677,6 +1444,14 @@ class OhhhllamaHandler(http.server.BaseHTTPRequestHandler):
         if ":" not in image and "@" not in image:
             image = f"{image}:latest"
         
+        # A pending image was validated when it was queued; skip Docker Hub
+        if is_model_queued(image):
+            self.send_json_response(200, {
+                "status": "already_queued",
+                "message": f"Docker image {image} is already in queue"
+            })
+            return
+        
         # Validate image exists on Docker Hub
         exists, error = validate_docker_image(image)
         if not exists:
@@ -687,43 +1462,28 @@ class OhhhllamaHandler(http.server.BaseHTTPRequestHandler):
             })
             return
         
-        # Check rate limit
-        is_allowed, remaining = check_rate_limit(client_ip)
-        if not is_allowed:
+        # Add to queue with type='docker'
+        try:
+            result = add_to_queue(image, client_ip, "docker")
+        except DB_WRITE_ERRORS as e:
+            self.send_write_failed(e)
+            return
+        
+        if result["status"] == "rate_limited":
             self.send_json_response(429, {
                 "error": "Rate limit exceeded",
                 "message": f"Maximum {RATE_LIMIT} requests per day"
             })
             return
         
-        # Check if already in queue
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT COUNT(*) FROM queue 
-            WHERE model = ? AND type = 'docker' AND status = 'pending'
-        """, (image,))
-        
-        if cursor.fetchone()[0] > 0:
-            conn.close()
+        if result["status"] == "already_queued":
             self.send_json_response(200, {
                 "status": "already_queued",
                 "message": f"Docker image {image} is already in queue"
             })
             return
         
-        # Add to queue with type='docker'
-        cursor.execute("""
-            INSERT INTO queue (model, type, requester_ip, status)
-            VALUES (?, 'docker', ?, 'pending')
-        """, (image, client_ip))
-        
-        queue_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
-        increment_rate_limit(client_ip)
-        
+        queue_id = result["queue_id"]
         logger.info(f"Queued Docker image {image} (id={queue_id}) from {client_ip}")
         
         self.send_json_response(202, {
@@ -738,7 +1498,7 @@ class OhhhllamaHandler(http.server.BaseHTTPRequestHandler):
         client_ip = self.get_client_ip()
         
         try:
-            data = json.loads(body.decode())
+            data = _loads(body)
         except json.JSONDecodeError:
             self.send_json_response(400, {"error": "Invalid JSON"})
             return
@@ -748,49 +1508,71 @@ class OhhhllamaHandler(http.server.BaseHTTPRequestHandler):
             self.send_json_response(400, {"error": "Model name required"})
             return
         
-        # Check if model already exists
-        if check_model_exists(model):
-            logger.info(f"Model {model} already exists, passing through")
-            self.proxy_request("POST", body)
-            return
-        
-        # Check disk space before queueing
-        disk_ok, disk_stats = check_disk_space()
-        if not disk_ok:
-            logger.warning(f"Disk space critical ({disk_stats.get('used_percent', '?')}%), rejecting pull request")
-            self.send_json_response(507, {
-                "error": "Insufficient storage",
-                "message": f"Disk usage at {disk_stats.get('used_percent', '?')}% (threshold: {DISK_THRESHOLD}%)",
-                "disk": disk_stats
-            })
+        # Turn away rate-limited clients before any backend or disk work
+        remaining = quota_remaining(client_ip)
+        if remaining <= 0:
+            self.send_rate_limited(client_ip)
             return
         
-        # Check rate limit
-        is_allowed, remaining = check_rate_limit(client_ip)
-        if not is_allowed:
-            logger.warning(f"Rate limit exceeded for {client_ip}")
-            self.send_json_response(429, {
-                "error": "Rate limit exceeded",
-                "message": f"Maximum {RATE_LIMIT} model requests per day",
-                "remaining": 0
-            })
-            return
+        # A repeat pull of a pending model needs no backend round-trip
+        if is_model_queued(model):
+            result = {"status": "already_queued", "remaining": remaining}
+        else:
+            model_base = model.partition(":")[0]
+            
+            # Check if model already exists
+            if check_model_exists(model, model_base):
+                logger.info(f"Model {model} already exists, passing through")
+                self.proxy_request("POST", body)
+                invalidate_tags_cache()
+                return
+            
+            # Check disk space before queueing
+            disk_ok, disk_stats = check_disk_space()
+            if not disk_ok:
+                logger.warning(f"Disk space critical ({disk_stats.get('used_percent', '?')}%), rejecting pull request")
+                self.send_json_response(507, {
+                    "error": "Insufficient storage",
+                    "message": f"Disk usage at {disk_stats.get('used_percent', '?')}% (threshold: {DISK_THRESHOLD}%)",
+                    "disk": disk_stats
+                })
+                return
+            
+            # Add to queue
+            try:
+                result = add_to_queue(model, client_ip)
+            except DB_WRITE_ERRORS as e:
+                self.send_write_failed(e)
+                return
+            
+            if result["status"] == "rate_limited":
+                self.send_rate_limited(client_ip)
+                return
         
-        # Add to queue
-        result = add_to_queue(model, client_ip)
+        if result["status"] == "already_queued":
+            response = {
+                "status": "already_queued",
+                "message": f"Model {model} is already in the download queue"
+            }
+        else:
+            logger.info(f"Queued model {model} (id={result['queue_id']}) from {client_ip}")
+            response = {
+                "status": "queued",
+                "message": f"Model {model} added to download queue",
+                "queue_id": result["queue_id"]
+            }
         
         # Add rate limit info to response
-        result["rate_limit"] = {
-            "remaining": remaining - 1,
+        response["rate_limit"] = {
+            "remaining": result["remaining"],
             "limit": RATE_LIMIT
         }
         
-        self.send_json_response(202, result)
+        self.send_json_response(202, response)
     
     def handle_queue_request(self) -> None:
         """Handle GET /api/queue requests."""
-        status = get_queue_status()
-        self.send_json_response(200, status)
+        self.send_json_bytes(200, get_queue_status_json())
     
     def handle_health_request(self) -> None:
         """
@@ -805,24 +1587,28 @@ class OhhhllamaHandler(http.server.BaseHTTPRequestHandler):
         checks = {}
         overall_status = "healthy"
         
+        # The backend round-trip runs while the local checks are done
+        backend_check = _health_pool.submit(check_backend_health)
+        
         # Proxy check (always ok if we're responding)
         checks["proxy"] = {"status": "ok"}
         
-        # Backend check
+        # Disk check
+        disk_ok, disk_stats = check_disk_space()
+        
+        # Database check
         try:
-            req = urllib.request.Request(f"{OLLAMA_BACKEND}/api/tags")
-            with urllib.request.urlopen(req, timeout=5) as response:
-                if response.status == 200:
-                    checks["backend"] = {"status": "ok", "url": OLLAMA_BACKEND}
-                else:
-                    checks["backend"] = {"status": "error", "url": OLLAMA_BACKEND}
-                    overall_status = "degraded"
+            with get_conn() as conn:
+                conn.execute("SELECT 1")
+            database_check = {"status": "ok", "path": DB_PATH}
         except Exception as e:
-            checks["backend"] = {"status": "error", "url": OLLAMA_BACKEND, "error": str(e)}
+            database_check = {"status": "error", "path": DB_PATH, "error": str(e)}
+        
+        # Backend check
+        checks["backend"] = backend_check.result()
+        if checks["backend"]["status"] != "ok":
             overall_status = "unhealthy"
         
-        # Disk check
-        disk_ok, disk_stats = check_disk_space()
         checks["disk"] = disk_stats
         if disk_stats.get("status") == "critical":
             overall_status = "unhealthy"
@@ -831,62 +1617,77 @@ class OhhhllamaHandler(http.server.BaseHTTPRequestHandler):
         elif disk_stats.get("status") == "error":
             overall_status = "degraded"
         
-        # Database check
-        try:
-            conn = sqlite3.connect(DB_PATH, timeout=5)
-            cursor = conn.cursor()
-            cursor.execute("SELECT 1")
-            conn.close()
-            checks["database"] = {"status": "ok", "path": DB_PATH}
-        except Exception as e:
-            checks["database"] = {"status": "error", "path": DB_PATH, "error": str(e)}
-            if overall_status == "healthy":
-                overall_status = "degraded"
+        checks["database"] = database_check
+        if database_check["status"] != "ok" and overall_status == "healthy":
+            overall_status = "degraded"
         
         response = {
             "status": overall_status,
             "checks": checks,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         }
         
         self.send_json_response(200, response)
     
     def handle_tags_request(self) -> None:
-        """Handle /api/tags - merge real models with queued models."""
+        """
+        Handle /api/tags - merge real models with queued models.
+        
+        UIs poll this endpoint, so the merged body is reused for
+        TAGS_RESPONSE_TTL seconds, and after that for as long as the
+        backend listing and the pending models are unchanged. Cached bodies
+        are sent after releasing _tags_cache_lock, so a slow client can't
+        hold it.
+        """
+        with _tags_cache_lock:
+            fresh = time.monotonic() - _tags_response["ts"] < TAGS_RESPONSE_TTL
+            body = _tags_response["body"]
+        if fresh:
+            self.send_json_bytes(200, body)
+            return
+        
         # 1. Fetch real models from backend
         try:
-            url = f"{OLLAMA_BACKEND}/api/tags"
-            req = urllib.request.Request(url)
-            with urllib.request.urlopen(req, timeout=10) as response:
-                data = json.loads(response.read().decode())
+            raw = fetch_tags()
         except Exception as e:
             logger.error(f"Failed to fetch tags from backend: {e}")
             self.send_json_response(502, {"error": "Backend unavailable"})
             return
         
         # 2. Get pending models from queue
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT DISTINCT model, created_at FROM queue 
-            WHERE status = 'pending' 
-            ORDER BY created_at ASC
-        """)
-        pending = cursor.fetchall()
-        conn.close()
+        with get_conn() as conn:
+            pending = conn.execute("""
+                SELECT model, created_at FROM queue INDEXED BY idx_queue_pending
+                WHERE status = 'pending'
+                ORDER BY created_at ASC
+            """).fetchall()
+        
+        key = (raw, tuple(pending))
+        with _tags_cache_lock:
+            unchanged = _tags_response["key"] == key
+            if unchanged:
+                _tags_response["ts"] = time.monotonic()
+                body = _tags_response["body"]
+        if unchanged:
+            self.send_json_bytes(200, body)
+            return
+        
+        try:
+            data = _loads(raw)
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to fetch tags from backend: {e}")
+            self.send_json_response(502, {"error": "Backend unavailable"})
+            return
         
-        # 3. Get list of real model names for dedup
-        real_model_names = set()
-        for m in data.get("models", []):
-            name = m.get("name", "")
-            real_model_names.add(name)
-            real_model_names.add(name.split(":")[0])  # Also add base name
+        # 3. Get real model names (and base names) for dedup, keeping the
+        # listing for check_model_exists()
+        names, bases = store_tags(data)
+        real_model_names = names | bases
         
         # 4. Append queued models (if not already downloaded)
         for model_name, created_at in pending:
             # Skip if model already exists
-            base_name = model_name.split(":")[0]
-            if model_name in real_model_names or base_name in real_model_names:
+            if model_name in real_model_names or model_name.partition(":")[0] in real_model_names:
                 continue
             
             # Add synthetic entry for queued model
@@ -896,47 +1697,51 @@ class OhhhllamaHandler(http.server.BaseHTTPRequestHandler):
                 "modified_at": created_at,
                 "size": 0,
                 "digest": "pending",
-                "details": {
-                    "parent_model": "",
-                    "format": "pending",
-                    "family": "queued",
-                    "families": ["queued"],
-                    "parameter_size": "unknown",
-                    "quantization_level": "N/A"
-                }
+                "details": QUEUED_MODEL_DETAILS
             })
         
-        self.send_json_response(200, data)
+        body = _dumps(data)
+        with _tags_cache_lock:
+            _tags_response.update(ts=time.monotonic(), key=key, body=body)
+        
+        self.send_json_bytes(200, body)
     
     def do_GET(self) -> None:
         """Handle GET requests."""
-        if self.path == "/api/queue":
-            self.handle_queue_request()
-        elif self.path == "/api/health":
-            self.handle_health_request()
-        elif self.path == "/api/tags":
-            self.handle_tags_request()
+        handler = self.GET_ROUTES.get(self.path.partition("?")[0])
+        if handler is not None:
+            handler(self)
         else:
             self.proxy_request("GET")
     
+    def read_body(self) -> Optional[bytes]:
+        """
+        Read the full request body (only used for intercepted endpoints).
+        
+        These endpoints take small JSON documents, so bodies larger than
+        MAX_JSON_BODY are refused with 413 instead of being buffered.
+        Returns None when the request has been answered that way.
+        """
+        if self.content_length > MAX_JSON_BODY:
+            self.close_connection = True
+            self.send_json_response(413, {"error": "Request body too large"})
+            return None
+        return self.rfile.read(self.content_length) if self.content_length > 0 else b""
+    
     def do_POST(self) -> None:
         """Handle POST requests."""
-        content_length = int(self.headers.get("Content-Length", 0))
-        body = self.rfile.read(content_length) if content_length > 0 else b""
-        
-        if self.path == "/api/pull":
-            self.handle_pull_request(body)
-        elif self.path == "/api/hf/queue":
-            self.handle_hf_queue_request(body)
-        elif self.path == "/api/docker/queue":
-            self.handle_docker_queue_request(body)
+        handler = self.POST_ROUTES.get(self.path.partition("?")[0])
+        if handler is not None:
+            body = self.read_body()
+            if body is not None:
+                handler(self, body)
         else:
-            self.proxy_request("POST", body)
+            self.proxy_request("POST")
     
     def handle_queue_delete(self, body: bytes) -> None:
         """Handle DELETE /api/queue - remove a model from the queue."""
         try:
-            data = json.loads(body.decode())
+            data = _loads(body)
         except json.JSONDecodeError:
             self.send_json_response(400, {"error": "Invalid JSON"})
             return
@@ -946,18 +1751,12 @@ class OhhhllamaHandler(http.server.BaseHTTPRequestHandler):
             self.send_json_response(400, {"error": "Model name required"})
             return
         
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
         # Only delete pending models (not downloading/completed/failed)
-        cursor.execute("""
-            DELETE FROM queue 
-            WHERE model = ? AND status = 'pending'
-        """, (model,))
-        
-        deleted = cursor.rowcount
-        conn.commit()
-        conn.close()
+        try:
+            deleted = delete_pending(model)
+        except DB_WRITE_ERRORS as e:
+            self.send_write_failed(e)
+            return
         
         if deleted > 0:
             logger.info(f"Removed {model} from queue")
@@ -974,7 +1773,7 @@ class OhhhllamaHandler(http.server.BaseHTTPRequestHandler):
     def handle_model_delete(self, body: bytes) -> None:
         """Handle DELETE /api/delete - delete queued or real model."""
         try:
-            data = json.loads(body.decode())
+            data = _loads(body)
         except json.JSONDecodeError:
             self.send_json_response(400, {"error": "Invalid JSON"})
             return
@@ -990,67 +1789,235 @@ class OhhhllamaHandler(http.server.BaseHTTPRequestHandler):
             # Extract actual model name: "* llama2:7b [QUEUED]" -> "llama2:7b"
             model = model.replace("* ", "").replace(" [QUEUED]", "").strip()
         
-        # Check if this model is in our queue
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT id FROM queue 
-            WHERE model = ? AND status = 'pending'
-        """, (model,))
-        queued = cursor.fetchone()
-        
-        if queued:
-            # It's a queued model - delete from queue
-            cursor.execute("""
-                DELETE FROM queue 
-                WHERE model = ? AND status = 'pending'
-            """, (model,))
-            conn.commit()
-            conn.close()
-            
+        # If this model is in our queue, delete it from there
+        try:
+            deleted = delete_pending(model)
+        except DB_WRITE_ERRORS as e:
+            self.send_write_failed(e)
+            return
+        
+        if deleted > 0:
             logger.info(f"Removed queued model {model} from queue")
             # Return success in Ollama's expected format
             self.send_json_response(200, {"status": "success"})
         else:
-            conn.close()
             # Not in queue - pass through to Ollama to delete real model
             # Reconstruct body with cleaned model name in case it had [QUEUED] suffix
-            clean_body = json.dumps({"name": model}).encode()
-            self.proxy_request("DELETE", clean_body)
+            clean_body = _dumps({"name": model})
+            if self.proxy_request("DELETE", clean_body) == 200:
+                # Forget the finished pull so it isn't queued again
+                try:
+                    delete_completed(model)
+                except DB_WRITE_ERRORS as e:
+                    logger.warning(f"Could not clear queue history for {model}: {e}")
+            invalidate_tags_cache()
     
     def do_DELETE(self) -> None:
         """Handle DELETE requests."""
-        content_length = int(self.headers.get("Content-Length", 0))
-        body = self.rfile.read(content_length) if content_length > 0 else b""
-        
-        if self.path == "/api/queue":
-            # Direct queue management
-            self.handle_queue_delete(body)
-        elif self.path == "/api/delete":
-            # Intercept model delete - check if queued or real
-            self.handle_model_delete(body)
+        handler = self.DELETE_ROUTES.get(self.path.partition("?")[0])
+        if handler is not None:
+            body = self.read_body()
+            if body is not None:
+                handler(self, body)
         else:
-            self.proxy_request("DELETE", body)
+            self.proxy_request("DELETE")
     
     def do_PUT(self) -> None:
         """Handle PUT requests."""
-        content_length = int(self.headers.get("Content-Length", 0))
-        body = self.rfile.read(content_length) if content_length > 0 else b""
-        self.proxy_request("PUT", body)
+        self.proxy_request("PUT")
     
     def do_HEAD(self) -> None:
         """Handle HEAD requests."""
         self.proxy_request("HEAD")
+    
+    # Intercepted endpoints by method (query string ignored); every other
+    # path is proxied to the backend. POST and DELETE handlers get the body.
+    GET_ROUTES = {
+        "/api/queue": handle_queue_request,
+        "/api/health": handle_health_request,
+        "/api/tags": handle_tags_request,
+    }
+    POST_ROUTES = {
+        "/api/pull": handle_pull_request,
+        "/api/hf/queue": handle_hf_queue_request,
+        "/api/docker/queue": handle_docker_queue_request,
+    }
+    DELETE_ROUTES = {
+        # Direct queue management
+        "/api/queue": handle_queue_delete,
+        # Intercept model delete - check if queued or real
+        "/api/delete": handle_model_delete,
+    }
 
 
-class ThreadedHTTPServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
-    """Threaded HTTP server for handling concurrent requests."""
+class ThreadedHTTPServer(http.server.HTTPServer):
+    """
+    Threaded HTTP server for handling concurrent requests.
+    
+    Connections are handed to a ThreadPoolExecutor of HANDLER_POOL_SIZE
+    threads instead of starting a new thread for each one. A connection is
+    only accepted into the pool while a thread is free for it, so nothing
+    queues behind long-running streams; when all are busy it gets a 503.
+    """
     allow_reuse_address = True
-    daemon_threads = True
+    reuse_port = False
+    
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._executor = ThreadPoolExecutor(max_workers=HANDLER_POOL_SIZE, thread_name_prefix="handler")
+        self._busy_lock = threading.Lock()
+        self._busy = 0
+    
+    def process_request(self, request: socket.socket, client_address: tuple) -> None:
+        """Hand the connection to a free handler thread, or refuse it if there is none."""
+        with self._busy_lock:
+            saturated = self._busy >= HANDLER_POOL_SIZE
+            if not saturated:
+                self._busy += 1
+        
+        if saturated:
+            self.refuse_request(request, client_address)
+        else:
+            self._executor.submit(self.process_request_thread, request, client_address)
+    
+    def process_request_thread(self, request: socket.socket, client_address: tuple) -> None:
+        """Handle one connection on a pool thread."""
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            with self._busy_lock:
+                self._busy -= 1
+    
+    def refuse_request(self, request: socket.socket, client_address: tuple) -> None:
+        """Answer 503 on the accepting thread and close the connection."""
+        logger.warning(f"All {HANDLER_POOL_SIZE} handler threads busy, refusing {client_address[0]}")
+        try:
+            # The response fits in the empty send buffer; the timeout only
+            # guards the accept loop against a misbehaving peer
+            request.settimeout(1)
+            request.sendall(SERVER_BUSY_RESPONSE)
+        except OSError:
+            pass
+        self.shutdown_request(request)
+    
+    def server_close(self) -> None:
+        super().server_close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+    
+    def server_bind(self) -> None:
+        """Bind the listening socket, sharing the port between workers if enabled."""
+        if self.reuse_port:
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        if self.address_family == socket.AF_INET6:
+            # Accept IPv4 connections on the same socket
+            self.socket.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_V6ONLY, 0)
+        super().server_bind()
+    
+    def get_request(self) -> tuple[socket.socket, tuple]:
+        """Accept a connection and tune its socket for streaming responses."""
+        request, client_address = super().get_request()
+        request.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        request.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, CLIENT_SNDBUF_SIZE)
+        return request, client_address
+
+
+def close_pools() -> None:
+    """Close idle pooled database and backend connections."""
+    for pool in (_db_pool, _backend_pool):
+        while True:
+            try:
+                pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+def serve(reuse_port: bool = False) -> None:
+    """Run the proxy server in this process until interrupted, then exit."""
+    threading.stack_size(HANDLER_STACK_SIZE)
+    ThreadedHTTPServer.reuse_port = reuse_port
+    
+    # Serve IPv6 clients as well when the host supports a dual-stack socket
+    if socket.has_dualstack_ipv6():
+        ThreadedHTTPServer.address_family = socket.AF_INET6
+        address = ("::", LISTEN_PORT)
+        listen_address = f"[::]:{LISTEN_PORT}"
+    else:
+        address = ("0.0.0.0", LISTEN_PORT)
+        listen_address = f"0.0.0.0:{LISTEN_PORT}"
+    
+    server = ThreadedHTTPServer(address, OhhhllamaHandler)
+    logger.info(f"Proxy listening on {listen_address} (pid {os.getpid()})")
+    
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down...")
+        server.server_close()
+        # Exit without the interpreter's shutdown, which would join every
+        # handler thread and so wait for open streams to finish
+        _log_listener.stop()
+        os._exit(0)
+
+
+def serve_workers(count: int) -> None:
+    """
+    Fork worker processes that each accept on the listening port.
+    
+    Every worker binds its own socket with SO_REUSEPORT and the kernel
+    spreads new connections across them, so request handling isn't limited
+    to one core by the GIL. Rate limits and deduplication live in SQLite,
+    so they hold across processes; caches are per worker.
+    
+    The parent runs database maintenance and exits once all workers have.
+    """
+    # Connections must not be shared with the children, and the log
+    # listener thread doesn't survive the fork, so each process restarts it
+    close_pools()
+    _log_listener.stop()
+    
+    workers = set()
+    for _ in range(count):
+        pid = os.fork()
+        if pid == 0:
+            _log_listener.start()
+            try:
+                serve(reuse_port=True)
+            finally:
+                _log_listener.stop()
+                os._exit(0)
+        workers.add(pid)
+    
+    _log_listener.start()
+    logger.info(f"Started {count} workers")
+    threading.Thread(target=run_maintenance, name="maintenance", daemon=True).start()
+    
+    def stop_workers(signum: int, frame: Any = None) -> None:
+        for worker in workers:
+            try:
+                os.kill(worker, signum)
+            except ProcessLookupError:
+                pass
+    
+    signal.signal(signal.SIGTERM, stop_workers)
+    
+    while workers:
+        try:
+            pid, status = os.wait()
+        except KeyboardInterrupt:
+            stop_workers(signal.SIGINT)
+            continue
+        workers.discard(pid)
+        logger.warning(f"Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}")
 
 
 def main() -> None:
     """Main entry point."""
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+    
     logger.info("=" * 50)
     logger.info("ohhhllama - Ollama Proxy with Download Queue")
     logger.info("=" * 50)
@@ -1061,18 +2028,14 @@ def main() -> None:
     logger.info(f"Disk path: {DISK_PATH}")
     logger.info(f"Disk threshold: {DISK_THRESHOLD}%")
     logger.info(f"Cleanup days: {CLEANUP_DAYS}")
+    logger.info(f"Workers: {PROXY_WORKERS}")
     
     # Initialize database
     init_database()
     
-    # Cleanup orphaned downloads from interrupted previous runs
-    cleanup_orphaned_downloads()
-    
-    # Cleanup old completed/failed entries
-    cleanup_old_entries()
-    
-    # Verify completed models actually exist
-    verify_completed_models()
+    # Reset downloads orphaned by interrupted previous runs and remove old
+    # completed/failed entries and stale rate-limit rows
+    startup_maintenance()
     
     # Check disk space
     disk_ok, disk_stats = check_disk_space()
@@ -1081,25 +2044,27 @@ def main() -> None:
     else:
         logger.warning(f"Disk space critical: {disk_stats.get('used_percent', '?')}% used")
     
-    # Test backend connectivity
+    # Test backend connectivity (/api/version is tiny, unlike the model list)
     try:
-        req = urllib.request.Request(f"{OLLAMA_BACKEND}/api/tags")
-        with urllib.request.urlopen(req, timeout=5) as response:
-            logger.info("Backend connectivity: OK")
+        status, _ = backend_request("GET", "/api/version", timeout=5)
+        if status != 200:
+            raise http.client.HTTPException(f"/api/version returned {status}")
+        logger.info("Backend connectivity: OK")
     except Exception as e:
         logger.warning(f"Backend connectivity: FAILED ({e})")
         logger.warning("Proxy will start anyway, but requests may fail")
     
-    # Start server
-    server = ThreadedHTTPServer(("0.0.0.0", LISTEN_PORT), OhhhllamaHandler)
-    logger.info(f"Proxy listening on 0.0.0.0:{LISTEN_PORT}")
     logger.info("Press Ctrl+C to stop")
     
-    try:
-        server.serve_forever()
-    except KeyboardInterrupt:
-        logger.info("Shutting down...")
-        server.shutdown()
+    if PROXY_WORKERS > 1:
+        serve_workers(PROXY_WORKERS)
+        return
+    
+    # Verify completed models and repeat the cleanup periodically while running
+    threading.Thread(target=run_maintenance, name="maintenance", daemon=True).start()
+    
+    # Start server
+    serve()
 
 
 if __name__ == "__main__":
@@ -120,15 +120,17 @@ get_pending_models() {
 }
 
 # Update model status
+# (.timeout: wait for the proxy's write transactions instead of failing
+# with "database is locked")
 update_status() {
     local model="$1"
     local new_status="$2"
     local error_msg="${3:-}"
     
     if [[ -n "$error_msg" ]]; then
-        sqlite3 "$DB_PATH" "UPDATE queue SET status = '$new_status', error = '$error_msg', updated_at = datetime('now') WHERE model = '$model' AND status IN ('pending', 'downloading');"
+        sqlite3 -cmd ".timeout 5000" "$DB_PATH" "UPDATE queue SET status = '$new_status', error = '$error_msg', updated_at = datetime('now') WHERE model = '$model' AND status IN ('pending', 'downloading');"
     else
-        sqlite3 "$DB_PATH" "UPDATE queue SET status = '$new_status', updated_at = datetime('now') WHERE model = '$model' AND status IN ('pending', 'downloading');"
+        sqlite3 -cmd ".timeout 5000" "$DB_PATH" "UPDATE queue SET status = '$new_status', updated_at = datetime('now') WHERE model = '$model' AND status IN ('pending', 'downloading');"
     fi
 }
 